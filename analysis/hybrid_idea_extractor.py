@@ -1,14 +1,17 @@
 """
 Hybrid idea extraction module that combines traditional NLP with AI-powered synthesis.
 """
+import asyncio
 import logging
 import json
 import re
-from typing import List, Dict, Optional, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional, Any, Tuple, AsyncIterator
 from datetime import datetime
 from collections import defaultdict
 import openai
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 try:
     from analysis.idea_extractor import IdeaExtractor
@@ -17,17 +20,93 @@ except ImportError as e:
     print(f"spaCy not available: {e}")
     SPACY_AVAILABLE = False
     from analysis.idea_extractor_nltk_only import create_nltk_fallback
+from analysis.openai_client import create_async_openai_client, get_openai_client
+from storage.cache import llm_cache, normalize_prompt
 from storage.database import db_manager
 from storage.models import RawData, ExtractedIdea
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# API keys whose test call already succeeded in this process; later extractors skip it
+_VERIFIED_OPENAI_KEYS = set()
+
+# Static part of every synthesis prompt. It is sent as the system message, ahead
+# of the sources, so repeated calls share an identical prefix.
+SYNTHESIS_INSTRUCTIONS = """You are an expert in philanthropic intervention design and effective altruism.
+
+You will be given related sources about one cause area. Generate 2-3 novel philanthropic intervention ideas that:
+1. Combine insights from multiple sources
+2. Address gaps not covered by individual sources
+3. Are feasible and scalable
+4. Have high potential impact
+
+For each idea, provide:
+- Title: A concise, descriptive title
+- Description: Detailed explanation of the intervention
+- Key Innovation: What makes this approach novel
+- Expected Impact: Specific outcomes and metrics
+- Implementation: Key steps to implement
+- Challenges: Potential obstacles and solutions
+
+IMPORTANT: Respond ONLY with valid JSON in this exact format:
+{
+    "ideas": [
+        {
+            "title": "Title here",
+            "description": "Description here",
+            "key_innovation": "Innovation here",
+            "expected_impact": "Impact here",
+            "implementation": "Implementation here",
+            "challenges": "Challenges here"
+        }
+    ]
+}
+
+Do not include any other text, only the JSON response."""
+
+# Start of the ideas array in a (possibly partial) synthesis response
+IDEAS_ARRAY_START = re.compile(r'"ideas"\s*:\s*\[')
+
+# Fields read by _parse_synthesis_response, enforced through structured outputs
+SYNTHESIS_IDEA_FIELDS = ["title", "description", "key_innovation", "expected_impact", "implementation", "challenges"]
+SYNTHESIS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "idea_list",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "ideas": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {field: {"type": "string"} for field in SYNTHESIS_IDEA_FIELDS},
+                        "required": SYNTHESIS_IDEA_FIELDS,
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["ideas"],
+            "additionalProperties": False
+        }
+    }
+}
+
 
 class HybridIdeaExtractor(IdeaExtractor):
     """Enhanced idea extractor that combines traditional NLP with AI synthesis."""
     
-    def __init__(self, ai_provider: str = "openai"):
+    def __init__(self, ai_provider: str = "openai", ai_client: Optional[Any] = None,
+                 async_ai_client: Optional[AsyncOpenAI] = None):
+        """Create the extractor, optionally with injected OpenAI clients.
+        
+        ``ai_client`` is used for sync calls and skips the startup probe. The
+        concurrent pipeline calls use ``async_ai_client`` if given (the caller owns
+        it and it must belong to the loop the pipeline runs on); otherwise a
+        per-run async client is built with ``ai_client``'s key and base URL.
+        """
         if SPACY_AVAILABLE:
             super().__init__()
         else:
@@ -43,7 +122,8 @@ class HybridIdeaExtractor(IdeaExtractor):
             "idea_synthesis": "gpt-4o"        # 4o for idea determination (higher quality)
         }
         
-        self.ai_client = self._initialize_ai_client()
+        self.ai_client = ai_client or self._initialize_ai_client()
+        self.async_ai_client = async_ai_client
         
         # Enhanced keywords for better clustering
         self.enhanced_keywords = {
@@ -96,13 +176,15 @@ class HybridIdeaExtractor(IdeaExtractor):
                     return None
                 
                 try:
-                    client = OpenAI(api_key=api_key)
-                    # Test the client with a simple call using 4o-mini
-                    test_response = client.chat.completions.create(
-                        model=self.models["data_ingestion"],
-                        messages=[{"role": "user", "content": "test"}],
-                        max_tokens=5
-                    )
+                    client = get_openai_client(api_key)
+                    if api_key not in _VERIFIED_OPENAI_KEYS:
+                        # Test the client with a simple call using 4o-mini
+                        test_response = client.chat.completions.create(
+                            model=self.models["data_ingestion"],
+                            messages=[{"role": "user", "content": "test"}],
+                            max_tokens=5
+                        )
+                        _VERIFIED_OPENAI_KEYS.add(api_key)
                     logger.info("OpenAI API client initialized successfully with 4o-mini and 4o models")
                     return client
                 except Exception as api_error:
@@ -144,25 +226,25 @@ class HybridIdeaExtractor(IdeaExtractor):
                 
                 logger.info(f"Starting hybrid idea extraction from {len(raw_data_items)} items")
                 
+                # Parse every source once; all later steps reuse these docs
+                docs = self._parse_sources(raw_data_items)
+                
                 # Step 1: Traditional sentence extraction (baseline) + AI ingestion
                 basic_ideas = []
-                ai_ingested_ideas = []
+                ingestion_requests = []
                 
                 for item in raw_data_items:
-                    # Traditional extraction
-                    ideas = self._extract_ideas_from_item(item)
-                    basic_ideas.extend(ideas)
-                    
-                    # AI ingestion for individual items (using 4o-mini)
+                    basic_ideas.extend(self._extract_ideas_from_item(item))
                     if self.ai_client:
-                        try:
-                            text_content = f"{item.title} {item.abstract or ''}"
-                            domain = self._classify_domain(text_content, self.nlp(text_content))
-                            if domain:
-                                ai_ideas = self._call_ai_for_data_ingestion(text_content, domain)
-                                ai_ingested_ideas.extend(ai_ideas)
-                        except Exception as e:
-                            logger.warning(f"AI ingestion failed for item {item.id}: {e}")
+                        request = self._ingestion_request(item, docs.get(item.id))
+                        if request:
+                            ingestion_requests.append(request)
+                
+                # Same-domain items share one 4o-mini call; batches run concurrently
+                ai_ingested_ideas = []
+                if ingestion_requests:
+                    for item_ideas in self._run_coroutine(self._ingest_items_async(ingestion_requests)):
+                        ai_ingested_ideas.extend(item_ideas)
                 
                 logger.info(f"Extracted {len(basic_ideas)} basic ideas")
                 logger.info(f"AI ingested {len(ai_ingested_ideas)} ideas using 4o-mini")
@@ -171,7 +253,7 @@ class HybridIdeaExtractor(IdeaExtractor):
                 synthetic_ideas = []
                 if self.ai_client:
                     try:
-                        synthetic_ideas = self._generate_synthetic_ideas(raw_data_items)
+                        synthetic_ideas = self._generate_synthetic_ideas(raw_data_items, docs)
                         logger.info(f"Generated {len(synthetic_ideas)} AI-synthesized ideas")
                     except Exception as e:
                         logger.warning(f"AI synthesis failed: {e}. Continuing with traditional methods.")
@@ -180,7 +262,7 @@ class HybridIdeaExtractor(IdeaExtractor):
                     logger.info("AI synthesis not available. Using traditional NLP and pattern recognition.")
                 
                 # Step 3: Cross-source pattern recognition
-                pattern_ideas = self._identify_cross_source_patterns(raw_data_items)
+                pattern_ideas = self._identify_cross_source_patterns(raw_data_items, docs)
                 logger.info(f"Identified {len(pattern_ideas)} pattern-based ideas")
                 
                 # Step 4: Combine and rank all ideas
@@ -194,27 +276,49 @@ class HybridIdeaExtractor(IdeaExtractor):
             logger.error(f"Failed to extract ideas using hybrid approach: {e}")
             return []
     
-    def _generate_synthetic_ideas(self, sources: List[RawData]) -> List[Dict[str, Any]]:
+    def _parse_sources(self, sources: List[RawData], batch_size: Optional[int] = None) -> Dict[int, Any]:
+        """Parse the title and abstract of each source in one batched spaCy pass."""
+        batch_size = batch_size or settings.SPACY_BATCH_SIZE
+        texts = [f"{source.title} {source.abstract or ''}" for source in sources]
+        return {source.id: doc for source, doc in zip(sources, self.nlp.pipe(texts, batch_size=batch_size))}
+    
+    def _source_doc(self, source: RawData, docs: Optional[Dict[int, Any]] = None):
+        """Return the pre-parsed doc for a source, parsing it on demand if missing."""
+        if docs and source.id in docs:
+            return docs[source.id]
+        return self.nlp(f"{source.title} {source.abstract or ''}")
+    
+    def _ingestion_request(self, item: RawData, doc=None) -> Optional[Tuple[int, str, str]]:
+        """Return the (raw_data_id, text, domain) triple to send for AI ingestion, or None if unclassified."""
+        text_content = f"{item.title} {item.abstract or ''}"
+        domain = self._classify_domain(text_content, doc if doc is not None else self.nlp(text_content))
+        return (item.id, text_content, domain) if domain else None
+    
+    def _generate_synthetic_ideas(self, sources: List[RawData],
+                                  docs: Optional[Dict[int, Any]] = None) -> List[Dict[str, Any]]:
         """Generate synthetic ideas using AI from multiple related sources."""
         if not self.ai_client:
             # Fallback: Generate synthetic ideas using traditional methods
-            return self._generate_fallback_synthetic_ideas(sources)
+            return self._generate_fallback_synthetic_ideas(sources, docs)
         
         try:
             # Group sources by domain
-            domain_groups = self._group_sources_by_domain(sources)
+            domain_groups = self._group_sources_by_domain(sources, docs)
             
-            synthetic_ideas = []
+            # Need multiple sources for synthesis
+            synthesis_requests = [
+                (self._create_synthesis_context(domain_sources), domain)
+                for domain, domain_sources in domain_groups.items()
+                if len(domain_sources) >= 2
+            ]
+            if not synthesis_requests:
+                return []
             
-            for domain, domain_sources in domain_groups.items():
-                if len(domain_sources) < 2:
-                    continue  # Need multiple sources for synthesis
-                
-                # Create context from multiple sources
-                context = self._create_synthesis_context(domain_sources)
-                
-                # Generate ideas for this domain
-                domain_ideas = self._call_ai_for_synthesis(context, domain)
+            # Domains are independent, so their OpenAI calls run concurrently
+            domain_results = self._run_async_synthesis(synthesis_requests)
+            
+            synthetic_ideas = []
+            for domain_ideas in domain_results:
                 synthetic_ideas.extend(domain_ideas)
             
             return synthetic_ideas
@@ -223,14 +327,15 @@ class HybridIdeaExtractor(IdeaExtractor):
             logger.error(f"Failed to generate synthetic ideas: {e}")
             return []
     
-    def _group_sources_by_domain(self, sources: List[RawData]) -> Dict[str, List[RawData]]:
+    def _group_sources_by_domain(self, sources: List[RawData],
+                                 docs: Optional[Dict[int, Any]] = None) -> Dict[str, List[RawData]]:
         """Group sources by their primary domain."""
         domain_groups = defaultdict(list)
         
         for source in sources:
             # Determine domain for this source
             text_content = f"{source.title} {source.abstract or ''}"
-            domain = self._classify_domain(text_content, self.nlp(text_content))
+            domain = self._classify_domain(text_content, self._source_doc(source, docs))
             
             if domain:
                 domain_groups[domain].append(source)
@@ -248,24 +353,308 @@ class HybridIdeaExtractor(IdeaExtractor):
         
         return "\n\n".join(context_parts)
     
-    def _call_ai_for_synthesis(self, context: str, domain: str) -> List[Dict[str, Any]]:
-        """Call AI service to generate synthetic ideas using 4o model for high-quality idea determination."""
+    def _run_async_synthesis(self, synthesis_requests: List[Tuple[str, str]]) -> List[List[Dict[str, Any]]]:
+        """Run the async synthesis calls to completion from synchronous code."""
+        return self._run_coroutine(self._generate_synthetic_ideas_async(synthesis_requests))
+    
+    def _run_coroutine(self, coroutine):
+        """Run a coroutine to completion from synchronous code."""
         try:
-            prompt = f"""
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        
+        # Already inside an event loop (e.g. API background tasks), so run on a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+    
+    @asynccontextmanager
+    async def _async_ai_client(self) -> AsyncIterator[AsyncOpenAI]:
+        """Yield the async client for one pipeline run: the injected one, or one matching ai_client."""
+        if self.async_ai_client is not None:
+            yield self.async_ai_client
+            return
+        
+        async with create_async_openai_client(self.ai_client.api_key, self.ai_client.base_url) as client:
+            yield client
+    
+    async def _ingest_items_async(self, ingestion_requests: List[Tuple[int, str, str]]) -> List[List[Dict[str, Any]]]:
+        """Run batched AI ingestion for (raw_data_id, text, domain) triples concurrently, bounded by OPENAI_MAX_CONCURRENCY."""
+        semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+        
+        async with self._async_ai_client() as client:
+            async def ingest(raw_data_ids: List[int], texts: List[str], domain: str) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    return await self._call_ai_for_batch_ingestion_async(client, texts, domain, raw_data_ids)
+            
+            return await asyncio.gather(*[
+                ingest(raw_data_ids, texts, domain)
+                for raw_data_ids, texts, domain in self._batch_ingestion_requests(ingestion_requests)
+            ])
+    
+    def _batch_ingestion_requests(self, ingestion_requests: List[Tuple[int, str, str]]) -> List[Tuple[List[int], List[str], str]]:
+        """Group (raw_data_id, text, domain) triples by domain into batches of OPENAI_INGESTION_BATCH_SIZE texts."""
+        batch_size = settings.OPENAI_INGESTION_BATCH_SIZE
+        domain_sources = defaultdict(list)
+        for raw_data_id, text_content, domain in ingestion_requests:
+            domain_sources[domain].append((raw_data_id, text_content))
+        
+        batches = []
+        for domain, sources in domain_sources.items():
+            for start in range(0, len(sources), batch_size):
+                raw_data_ids, texts = zip(*sources[start:start + batch_size])
+                batches.append((list(raw_data_ids), list(texts), domain))
+        return batches
+    
+    async def _generate_synthetic_ideas_async(self, synthesis_requests: List[Tuple[str, str]]) -> List[List[Dict[str, Any]]]:
+        """Synthesize ideas for each (context, domain) pair concurrently, bounded by OPENAI_MAX_CONCURRENCY."""
+        semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+        
+        async with self._async_ai_client() as client:
+            async def synthesize(context: str, domain: str) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    return await self._call_ai_for_synthesis_async(client, context, domain)
+            
+            return await asyncio.gather(*[
+                synthesize(context, domain) for context, domain in synthesis_requests
+            ])
+    
+    async def _call_ai_for_synthesis_async(self, client: AsyncOpenAI, context: str, domain: str) -> List[Dict[str, Any]]:
+        """Async counterpart of _call_ai_for_synthesis for a single domain."""
+        try:
+            params = self._synthesis_request_params(context, domain)
+            cached_content = self._get_cached_completion(params)
+            if cached_content is not None:
+                return self._parse_synthesis_response(cached_content, context, domain)
+            
+            response = await client.chat.completions.create(**params)
+            return self._parse_and_cache_synthesis(params, response.choices[0].message.content, context, domain)
+        except Exception as e:
+            logger.error(f"AI synthesis failed for {domain}: {e}")
+            return []
+    
+    def _call_ai_for_synthesis(self, context: str, domain: str, max_ideas: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Call AI service to generate synthetic ideas using 4o model for high-quality idea determination.
+        
+        The completion is streamed and closed as soon as the ideas array ends, or
+        once ``max_ideas`` ideas are complete when a limit is given.
+        """
+        try:
+            params = self._synthesis_request_params(context, domain)
+            cached_content = self._get_cached_completion(params)
+            if cached_content is not None:
+                return self._parse_synthesis_response(cached_content, context, domain)[:max_ideas]
+            
+            ideas, closed = self._stream_synthesis_ideas(params, max_ideas)
+            content = json.dumps({"ideas": ideas})
+            # Only a fully streamed ideas array is worth caching
+            if closed:
+                return self._parse_and_cache_synthesis(params, content, context, domain)[:max_ideas]
+            return self._parse_synthesis_response(content, context, domain)[:max_ideas]
+        except Exception as e:
+            logger.error(f"AI synthesis failed: {e}")
+            return []
+    
+    def _stream_synthesis_ideas(self, params: Dict[str, Any],
+                                max_ideas: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Stream a synthesis completion; return the complete idea objects and whether the array closed."""
+        stream = self.ai_client.chat.completions.create(**params, stream=True)
+        content = ""
+        ideas, closed = [], False
+        try:
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                content += delta
+                # An idea object or the array itself can only finish on a closing bracket
+                if "}" in delta or "]" in delta:
+                    ideas, closed = self._parse_streamed_ideas(content)
+                    if closed or (max_ideas and len(ideas) >= max_ideas):
+                        break
+        finally:
+            stream.close()
+        
+        return ideas, closed
+    
+    def _parse_streamed_ideas(self, content: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """Parse the complete idea objects from a partial synthesis response."""
+        match = IDEAS_ARRAY_START.search(content)
+        if not match:
+            return [], False
+        
+        decoder = json.JSONDecoder()
+        ideas = []
+        position = match.end()
+        while True:
+            # Skip the separators between array items
+            while position < len(content) and content[position] in " \t\r\n,":
+                position += 1
+            if position == len(content):
+                return ideas, False
+            if content[position] == "]":
+                return ideas, True
+            try:
+                idea, position = decoder.raw_decode(content, position)
+            except json.JSONDecodeError:
+                # The next idea is still being streamed
+                return ideas, False
+            ideas.append(idea)
+    
+    def _completion_cache_key(self, params: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Split request parameters into the normalized prompt and the remaining options."""
+        prompt = "\n".join(message["content"] for message in params["messages"])
+        options = {key: value for key, value in params.items() if key != "messages"}
+        return normalize_prompt(prompt), options
+    
+    def _get_cached_completion(self, params: Dict[str, Any]) -> Optional[str]:
+        """Return a cached synthesis completion for these request parameters, if any."""
+        if not settings.LLM_CACHE_ENABLED:
+            return None
+        
+        cached = llm_cache.get("openai_synthesis", *self._completion_cache_key(params))
+        return cached["data"]["content"] if cached else None
+    
+    def _parse_and_cache_synthesis(self, params: Dict[str, Any], content: str,
+                                   context: str, domain: str) -> List[Dict[str, Any]]:
+        """Parse a synthesis completion, caching it only if it produced ideas."""
+        ideas = self._parse_synthesis_response(content, context, domain)
+        if ideas and settings.LLM_CACHE_ENABLED:
+            query, options = self._completion_cache_key(params)
+            llm_cache.set("openai_synthesis", query, {"content": content}, options)
+        return ideas
+    
+    def _synthesis_request_params(self, context: str, domain: str) -> Dict[str, Any]:
+        """Build the chat completion parameters for a synthesis call."""
+        return {
+            "model": self.models["idea_synthesis"],
+            "messages": [
+                # Static instructions first and the per-call sources last, so every
+                # synthesis request shares the same prompt prefix for provider caching
+                {"role": "system", "content": SYNTHESIS_INSTRUCTIONS},
+                {"role": "user", "content": self._create_synthesis_prompt(context, domain)}
+            ],
+            # Deterministic, schema-valid output so identical prompts give reusable responses
+            "temperature": 0,
+            "seed": 42,
+            "response_format": SYNTHESIS_RESPONSE_FORMAT,
+            "max_tokens": 1000
+        }
+    
+    def _create_synthesis_prompt(self, context: str, domain: str) -> str:
+        """Create the per-call part of the synthesis prompt: the domain and its sources."""
+        return f"""
 Based on these related sources about {domain.replace('_', ' ')}:
 
 {context}
+"""
+    
+    def _parse_synthesis_response(self, content: str, context: str, domain: str) -> List[Dict[str, Any]]:
+        """Convert a synthesis JSON response into our idea format."""
+        # Number of sources actually included in the prompt context
+        source_count = len(re.findall(r"^Source \d+:", context, re.MULTILINE))
+        
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError:
+            logger.warning("Failed to parse AI response as JSON")
+            return []
+        
+        formatted_ideas = []
+        for idea in data.get("ideas", []):
+            formatted_idea = {
+                "title": idea.get("title", ""),
+                "description": idea.get("description", ""),
+                "domain": domain,
+                "primary_metric": self._classify_primary_metric(idea.get("description", ""), domain),
+                "idea_type": "newly_viable",  # AI-generated ideas are typically newly viable
+                "confidence_score": 0.8,  # High confidence for AI-synthesized ideas
+                "extraction_method": "ai_synthesis",
+                "key_innovation": idea.get("key_innovation", ""),
+                "expected_impact": idea.get("expected_impact", ""),
+                "implementation": idea.get("implementation", ""),
+                "challenges": idea.get("challenges", ""),
+                "thought_process": f"AI-synthesized idea combining insights from {source_count} related sources in {domain} domain"
+            }
+            formatted_ideas.append(formatted_idea)
+        
+        return formatted_ideas
+    
+    def _call_ai_for_data_ingestion(self, text_content: str, domain: str) -> List[Dict[str, Any]]:
+        """Call AI service for data ingestion using 4o-mini model (lower cost)."""
+        try:
+            response = self.ai_client.chat.completions.create(
+                **self._ingestion_request_params(text_content, domain)
+            )
+            return self._parse_ingestion_response(response.choices[0].message.content, domain)
+        except Exception as e:
+            logger.error(f"AI data ingestion failed: {e}")
+            return []
+    
+    async def _call_ai_for_data_ingestion_async(self, client: AsyncOpenAI, text_content: str, domain: str) -> List[Dict[str, Any]]:
+        """Async counterpart of _call_ai_for_data_ingestion."""
+        try:
+            response = await client.chat.completions.create(
+                **self._ingestion_request_params(text_content, domain)
+            )
+            return self._parse_ingestion_response(response.choices[0].message.content, domain)
+        except Exception as e:
+            logger.error(f"AI data ingestion failed: {e}")
+            return []
+    
+    async def _call_ai_for_batch_ingestion_async(self, client: AsyncOpenAI, texts: List[str], domain: str,
+                                                 raw_data_ids: List[int]) -> List[Dict[str, Any]]:
+        """Run data ingestion for several same-domain texts in a single 4o-mini call."""
+        try:
+            response = await client.chat.completions.create(
+                **self._batch_ingestion_request_params(texts, domain)
+            )
+            return self._parse_batch_ingestion_response(response.choices[0].message.content, domain, raw_data_ids)
+        except Exception as e:
+            logger.error(f"AI batch ingestion failed for {domain}: {e}")
+            return []
+    
+    def _ingestion_request_params(self, text_content: str, domain: str) -> Dict[str, Any]:
+        """Build the chat completion parameters for a data ingestion call."""
+        return {
+            "model": self.models["data_ingestion"],
+            "messages": [
+                {"role": "system", "content": "You are an expert in analyzing research and identifying philanthropic opportunities."},
+                {"role": "user", "content": self._create_ingestion_prompt(text_content, domain)}
+            ],
+            "temperature": 0.6,
+            "max_tokens": 800  # Lower token limit for cost efficiency
+        }
+    
+    def _batch_ingestion_request_params(self, texts: List[str], domain: str) -> Dict[str, Any]:
+        """Build the chat completion parameters for a batched data ingestion call."""
+        return {
+            "model": self.models["data_ingestion"],
+            "messages": [
+                {"role": "system", "content": "You are an expert in analyzing research and identifying philanthropic opportunities."},
+                {"role": "user", "content": self._create_batch_ingestion_prompt(texts, domain)}
+            ],
+            "temperature": 0.6,
+            "max_tokens": 800 * len(texts)  # Same per-source budget as single-item calls
+        }
+    
+    def _create_ingestion_prompt(self, text_content: str, domain: str) -> str:
+        """Create the data ingestion prompt for a single item."""
+        return f"""
+Analyze this text about {domain.replace('_', ' ')} and extract potential philanthropic intervention ideas:
 
-Generate 2-3 novel philanthropic intervention ideas that:
-1. Combine insights from multiple sources
-2. Address gaps not covered by individual sources
-3. Are feasible and scalable
-4. Have high potential impact
+{text_content[:2000]}  # Limit text length for cost efficiency
+
+Extract 1-2 intervention ideas that:
+1. Are directly related to the content
+2. Have clear potential for impact
+3. Are feasible to implement
+4. Address a specific problem or opportunity
 
 For each idea, provide:
 - Title: A concise, descriptive title
-- Description: Detailed explanation of the intervention
-- Key Innovation: What makes this approach novel
+- Description: Brief explanation of the intervention
+- Key Innovation: What makes this approach valuable
 - Expected Impact: Specific outcomes and metrics
 - Implementation: Key steps to implement
 - Challenges: Potential obstacles and solutions
@@ -286,63 +675,19 @@ IMPORTANT: Respond ONLY with valid JSON in this exact format:
 
 Do not include any other text, only the JSON response.
 """
-
-            response = self.ai_client.chat.completions.create(
-                model=self.models["idea_synthesis"],
-                messages=[
-                    {"role": "system", "content": "You are an expert in philanthropic intervention design and effective altruism."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
-            )
-            
-            content = response.choices[0].message.content
-            
-            # Parse JSON response
-            try:
-                data = json.loads(content)
-                ideas = data.get("ideas", [])
-                
-                # Convert to our format
-                formatted_ideas = []
-                for idea in ideas:
-                    formatted_idea = {
-                        "title": idea.get("title", ""),
-                        "description": idea.get("description", ""),
-                        "domain": domain,
-                        "primary_metric": self._classify_primary_metric(idea.get("description", ""), domain),
-                        "idea_type": "newly_viable",  # AI-generated ideas are typically newly viable
-                        "confidence_score": 0.8,  # High confidence for AI-synthesized ideas
-                        "extraction_method": "ai_synthesis",
-                        "key_innovation": idea.get("key_innovation", ""),
-                        "expected_impact": idea.get("expected_impact", ""),
-                        "implementation": idea.get("implementation", ""),
-                        "challenges": idea.get("challenges", ""),
-                        "thought_process": f"AI-synthesized idea combining insights from {len(sources)} related sources in {domain} domain"
-                    }
-                    formatted_ideas.append(formatted_idea)
-                
-                return formatted_ideas
-                
-            except json.JSONDecodeError:
-                logger.warning("Failed to parse AI response as JSON")
-                return []
-                
-        except Exception as e:
-            logger.error(f"AI synthesis failed: {e}")
-            return []
     
-    def _call_ai_for_data_ingestion(self, text_content: str, domain: str) -> List[Dict[str, Any]]:
-        """Call AI service for data ingestion using 4o-mini model (lower cost)."""
-        try:
-            prompt = f"""
-Analyze this text about {domain.replace('_', ' ')} and extract potential philanthropic intervention ideas:
+    def _create_batch_ingestion_prompt(self, texts: List[str], domain: str) -> str:
+        """Create one data ingestion prompt covering several numbered sources."""
+        sources = "\n\n".join(
+            f"Source {i}: {text_content[:2000]}" for i, text_content in enumerate(texts, 1)
+        )
+        return f"""
+Analyze each of these {len(texts)} texts about {domain.replace('_', ' ')} separately and extract potential philanthropic intervention ideas:
 
-{text_content[:2000]}  # Limit text length for cost efficiency
+{sources}
 
-Extract 1-2 intervention ideas that:
-1. Are directly related to the content
+For EACH source, extract 1-2 intervention ideas that:
+1. Are directly related to that source's content
 2. Have clear potential for impact
 3. Are feasible to implement
 4. Address a specific problem or opportunity
@@ -355,74 +700,94 @@ For each idea, provide:
 - Implementation: Key steps to implement
 - Challenges: Potential obstacles and solutions
 
-IMPORTANT: Respond ONLY with valid JSON in this exact format:
+IMPORTANT: Respond ONLY with valid JSON in this exact format, with one entry in "idea_sets" per source, in order:
 {{
-    "ideas": [
+    "idea_sets": [
         {{
-            "title": "Title here",
-            "description": "Description here",
-            "key_innovation": "Innovation here",
-            "expected_impact": "Impact here",
-            "implementation": "Implementation here",
-            "challenges": "Challenges here"
+            "source": 1,
+            "ideas": [
+                {{
+                    "title": "Title here",
+                    "description": "Description here",
+                    "key_innovation": "Innovation here",
+                    "expected_impact": "Impact here",
+                    "implementation": "Implementation here",
+                    "challenges": "Challenges here"
+                }}
+            ]
         }}
     ]
 }}
 
 Do not include any other text, only the JSON response.
 """
-
-            response = self.ai_client.chat.completions.create(
-                model=self.models["data_ingestion"],
-                messages=[
-                    {"role": "system", "content": "You are an expert in analyzing research and identifying philanthropic opportunities."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.6,
-                max_tokens=800  # Lower token limit for cost efficiency
-            )
-            
-            content = response.choices[0].message.content
-            
-            # Parse JSON response
-            try:
-                data = json.loads(content)
-                ideas = data.get("ideas", [])
-                
-                # Convert to our format
-                formatted_ideas = []
-                for idea in ideas:
-                    formatted_idea = {
-                        "title": idea.get("title", ""),
-                        "description": idea.get("description", ""),
-                        "domain": domain,
-                        "primary_metric": self._classify_primary_metric(idea.get("description", ""), domain),
-                        "idea_type": "newly_viable",  # AI-generated ideas are typically newly viable
-                        "confidence_score": 0.7,  # Slightly lower confidence for 4o-mini
-                        "extraction_method": "ai_ingestion",
-                        "key_innovation": idea.get("key_innovation", ""),
-                        "expected_impact": idea.get("expected_impact", ""),
-                        "implementation": idea.get("implementation", ""),
-                        "challenges": idea.get("challenges", ""),
-                        "thought_process": f"AI-ingested idea from {domain} domain using 4o-mini model"
-                    }
-                    formatted_ideas.append(formatted_idea)
-                
-                return formatted_ideas
-                
-            except json.JSONDecodeError:
-                logger.warning("Failed to parse AI ingestion response as JSON")
-                return []
-                
-        except Exception as e:
-            logger.error(f"AI data ingestion failed: {e}")
+    
+    def _parse_batch_ingestion_response(self, content: str, domain: str, raw_data_ids: List[int]) -> List[Dict[str, Any]]:
+        """Convert a batched data ingestion JSON response into our idea format, tagging each idea with its source."""
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError:
+            logger.warning("Failed to parse AI batch ingestion response as JSON")
+            return []
+        
+        # Keep the first idea set for each numbered source; drop out-of-range or repeated entries
+        source_count = len(raw_data_ids)
+        idea_sets = {}
+        for idea_set in data.get("idea_sets", []):
+            source = idea_set.get("source")
+            if isinstance(source, int) and 1 <= source <= source_count:
+                idea_sets.setdefault(source, idea_set.get("ideas", []))
+        
+        missing = sorted(set(range(1, source_count + 1)) - idea_sets.keys())
+        if missing:
+            logger.warning(f"AI batch ingestion for {domain} returned no ideas for source(s) {missing} of {source_count}")
+        
+        return [
+            formatted_idea
+            for source in sorted(idea_sets)
+            for formatted_idea in self._format_ingestion_ideas(idea_sets[source], domain, raw_data_ids[source - 1])
+        ]
+    
+    def _parse_ingestion_response(self, content: str, domain: str) -> List[Dict[str, Any]]:
+        """Convert a data ingestion JSON response into our idea format."""
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError:
+            logger.warning("Failed to parse AI ingestion response as JSON")
             return []
+        
+        return self._format_ingestion_ideas(data.get("ideas", []), domain)
     
-    def _generate_fallback_synthetic_ideas(self, sources: List[RawData]) -> List[Dict[str, Any]]:
+    def _format_ingestion_ideas(self, ideas: List[Dict[str, Any]], domain: str,
+                                raw_data_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Convert raw AI ingestion ideas into our idea format."""
+        formatted_ideas = []
+        for idea in ideas:
+            formatted_idea = {
+                "raw_data_id": raw_data_id,
+                "title": idea.get("title", ""),
+                "description": idea.get("description", ""),
+                "domain": domain,
+                "primary_metric": self._classify_primary_metric(idea.get("description", ""), domain),
+                "idea_type": "newly_viable",  # AI-generated ideas are typically newly viable
+                "confidence_score": 0.7,  # Slightly lower confidence for 4o-mini
+                "extraction_method": "ai_ingestion",
+                "key_innovation": idea.get("key_innovation", ""),
+                "expected_impact": idea.get("expected_impact", ""),
+                "implementation": idea.get("implementation", ""),
+                "challenges": idea.get("challenges", ""),
+                "thought_process": f"AI-ingested idea from {domain} domain using 4o-mini model"
+            }
+            formatted_ideas.append(formatted_idea)
+        
+        return formatted_ideas
+    
+    def _generate_fallback_synthetic_ideas(self, sources: List[RawData],
+                                           docs: Optional[Dict[int, Any]] = None) -> List[Dict[str, Any]]:
         """Generate sophisticated synthetic ideas using enhanced cross-paper analysis."""
         try:
             # Group sources by domain
-            domain_groups = self._group_sources_by_domain(sources)
+            domain_groups = self._group_sources_by_domain(sources, docs)
             
             synthetic_ideas = []
             
@@ -431,7 +796,7 @@ Do not include any other text, only the JSON response.
                     continue  # Need multiple sources for synthesis
                 
                 # Enhanced cross-paper analysis
-                cross_paper_insights = self._analyze_cross_paper_context_simple(domain_sources, domain)
+                cross_paper_insights = self._analyze_cross_paper_context_simple(domain_sources, domain, docs)
                 
                 # Generate multiple types of synthetic ideas
                 ideas = self._generate_contextual_ideas_simple(domain_sources, cross_paper_insights, domain)
@@ -443,7 +808,8 @@ Do not include any other text, only the JSON response.
             logger.error(f"Failed to generate fallback synthetic ideas: {e}")
             return []
     
-    def _analyze_cross_paper_context_simple(self, sources: List[RawData], domain: str) -> Dict[str, Any]:
+    def _analyze_cross_paper_context_simple(self, sources: List[RawData], domain: str,
+                                            docs: Optional[Dict[int, Any]] = None) -> Dict[str, Any]:
         """Simple but effective cross-paper context analysis."""
         try:
             # Extract key concepts from each source
@@ -455,7 +821,7 @@ Do not include any other text, only the JSON response.
             for source in sources:
                 # Extract keywords from title and abstract
                 text_content = f"{source.title} {source.abstract or ''}"
-                doc = self.nlp(text_content)
+                doc = self._source_doc(source, docs)
                 
                 # Extract noun phrases and key terms
                 for chunk in doc.noun_chunks:
@@ -660,20 +1026,21 @@ Do not include any other text, only the JSON response.
             "thought_process": f"Comprehensive analysis: integrated {len(frequent_concepts)} frequent concepts from {insights['source_count']} {domain} studies"
         }
     
-    def _identify_cross_source_patterns(self, sources: List[RawData]) -> List[Dict[str, Any]]:
+    def _identify_cross_source_patterns(self, sources: List[RawData],
+                                        docs: Optional[Dict[int, Any]] = None) -> List[Dict[str, Any]]:
         """Identify patterns across multiple sources to generate ideas."""
         try:
             # Extract key concepts from each source
             all_concepts = []
             for source in sources:
-                concepts = self._extract_key_concepts(source)
+                concepts = self._extract_key_concepts(source, self._source_doc(source, docs))
                 all_concepts.extend(concepts)
             
             # Find common themes
             themes = self._cluster_concepts(all_concepts)
             
             # Identify gaps
-            gaps = self._identify_research_gaps(themes, sources)
+            gaps = self._identify_research_gaps(themes, sources, docs)
             
             # Generate ideas based on gaps
             pattern_ideas = []
@@ -688,12 +1055,13 @@ Do not include any other text, only the JSON response.
             logger.error(f"Failed to identify cross-source patterns: {e}")
             return []
     
-    def _extract_key_concepts(self, source: RawData) -> List[str]:
+    def _extract_key_concepts(self, source: RawData, doc=None) -> List[str]:
         """Extract key concepts from a source."""
         text_content = f"{source.title} {source.abstract or ''}"
         
         # Use spaCy to extract noun phrases and key terms
-        doc = self.nlp(text_content)
+        if doc is None:
+            doc = self.nlp(text_content)
         
         concepts = []
         
@@ -728,7 +1096,8 @@ Do not include any other text, only the JSON response.
         
         return dict(themes)
     
-    def _identify_research_gaps(self, themes: Dict[str, List[str]], sources: List[RawData]) -> List[Dict[str, Any]]:
+    def _identify_research_gaps(self, themes: Dict[str, List[str]], sources: List[RawData],
+                                docs: Optional[Dict[int, Any]] = None) -> List[Dict[str, Any]]:
         """Identify gaps in current research."""
         gaps = []
         
@@ -736,7 +1105,7 @@ Do not include any other text, only the JSON response.
         domain_counts = defaultdict(int)
         for source in sources:
             text_content = f"{source.title} {source.abstract or ''}"
-            domain = self._classify_domain(text_content, self.nlp(text_content))
+            domain = self._classify_domain(text_content, self._source_doc(source, docs))
             if domain:
                 domain_counts[domain] += 1
         
@@ -925,25 +1294,34 @@ Do not include any other text, only the JSON response.
         
         try:
             with db_manager.get_session() as session:
-                for idea_data in ideas:
-                    # Create ExtractedIdea object
-                    extracted_idea = ExtractedIdea(
-                        raw_data_id=idea_data.get("raw_data_id"),
-                        title=idea_data.get("title", "")[:500],
-                        description=idea_data.get("description", ""),
-                        domain=idea_data.get("domain", ""),
-                        primary_metric=idea_data.get("primary_metric", ""),
-                        idea_type=idea_data.get("idea_type", ""),
-                        confidence_score=idea_data.get("confidence_score", 0.5),
-                        extraction_method=idea_data.get("extraction_method", "hybrid"),
-                        thought_process=idea_data.get("thought_process", ""),
-                        created_at=datetime.utcnow()
-                    )
-                    
-                    session.add(extracted_idea)
-                    saved_count += 1
+                created_at = datetime.utcnow()
+                rows = [
+                    {
+                        "raw_data_id": idea_data.get("raw_data_id"),
+                        "title": idea_data.get("title", "")[:500],
+                        "description": idea_data.get("description", ""),
+                        "domain": idea_data.get("domain", ""),
+                        "primary_metric": idea_data.get("primary_metric", ""),
+                        "idea_type": idea_data.get("idea_type", ""),
+                        "confidence_score": idea_data.get("confidence_score", 0.5),
+                        "extraction_method": idea_data.get("extraction_method", "hybrid"),
+                        "thought_process": idea_data.get("thought_process", ""),
+                        "created_at": created_at
+                    }
+                    for idea_data in ideas
+                    if idea_data.get("raw_data_id") is not None
+                ]
+                
+                # Synthesized and pattern-based ideas have no single source row
+                # and cannot satisfy the NOT NULL raw_data_id column
+                skipped = len(ideas) - len(rows)
+                if skipped:
+                    logger.info(f"Skipping {skipped} ideas without a source raw_data_id")
                 
+                # Bulk insert skips per-object unit-of-work bookkeeping
+                session.bulk_insert_mappings(ExtractedIdea, rows)
                 session.commit()
+                saved_count = len(rows)
                 logger.info(f"Saved {saved_count} hybrid-extracted ideas to database")
                 
         except Exception as e:
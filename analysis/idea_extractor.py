@@ -3,6 +3,7 @@ Idea extraction module for identifying philanthropic opportunities from raw data
 """
 import logging
 import re
+from functools import lru_cache
 from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 import nltk
@@ -18,6 +19,18 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# spaCy pipeline components the extractors never read, excluded so they are not
+# even loaded. The parser (noun chunks, dependencies), tagger/attribute_ruler
+# (POS) and NER (entities) are all used; lemmas come from NLTK's
+# WordNetLemmatizer instead.
+SPACY_EXCLUDED_COMPONENTS = ["lemmatizer"]
+
+
+@lru_cache(maxsize=4)
+def _load_nlp(name: str, excluded: Tuple[str, ...]):
+    """Load a spaCy model once per interpreter; extractors share the Language."""
+    return spacy.load(name, exclude=list(excluded))
+
 # Download required NLTK data
 try:
     nltk.data.find('tokenizers/punkt')
@@ -78,6 +91,12 @@ class IdeaExtractor:
             ]
         }
         
+        # Lower-cased once for _classify_domain, which runs for every sentence and source
+        self.classification_keywords = {
+            domain: frozenset(keyword.lower() for keyword in keywords)
+            for domain, keywords in self.opportunity_keywords.items()
+        }
+        
         # Phrases that indicate newly viable opportunities
         self.newly_viable_phrases = [
             "recent advances", "new technology", "breakthrough", "innovation",
@@ -98,12 +117,12 @@ class IdeaExtractor:
         """Initialize spaCy NLP model."""
         try:
             # Try to load English model, download if not available
-            self.nlp = spacy.load("en_core_web_sm")
+            self.nlp = _load_nlp("en_core_web_sm", tuple(SPACY_EXCLUDED_COMPONENTS))
         except OSError:
             logger.warning("spaCy English model not found. Installing...")
             import subprocess
             subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
+            self.nlp = _load_nlp("en_core_web_sm", tuple(SPACY_EXCLUDED_COMPONENTS))
     
     def extract_ideas_from_raw_data(self, raw_data_id: Optional[int] = None, 
                                   domain: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -150,16 +169,9 @@ class IdeaExtractor:
             if not text_content.strip():
                 return ideas
             
-            # Analyze the text
-            doc = self.nlp(text_content)
-            
             # Extract sentences that might contain ideas
             sentences = sent_tokenize(text_content)
-            
-            for sentence in sentences:
-                idea = self._extract_idea_from_sentence(sentence, raw_data)
-                if idea:
-                    ideas.append(idea)
+            ideas.extend(self._extract_ideas_from_sentences(sentences, raw_data))
             
             # Also analyze the full text if available
             if raw_data.full_text and len(raw_data.full_text) > len(text_content):
@@ -172,7 +184,21 @@ class IdeaExtractor:
             logger.error(f"Failed to extract ideas from item {raw_data.id}: {e}")
             return []
     
-    def _extract_idea_from_sentence(self, sentence: str, raw_data: RawData) -> Optional[Dict[str, Any]]:
+    def _extract_ideas_from_sentences(self, sentences: List[str], raw_data: RawData) -> List[Dict[str, Any]]:
+        """Extract ideas from sentences, parsing them all in one batched spaCy pass."""
+        # Skip sentences too short to be meaningful before paying for a parse
+        sentences = [sentence.strip() for sentence in sentences if len(sentence.strip()) >= 20]
+        docs = self.nlp.pipe(sentences, batch_size=settings.SPACY_BATCH_SIZE)
+        
+        ideas = []
+        for sentence, doc in zip(sentences, docs):
+            idea = self._extract_idea_from_sentence(sentence, raw_data, doc)
+            if idea:
+                ideas.append(idea)
+        
+        return ideas
+    
+    def _extract_idea_from_sentence(self, sentence: str, raw_data: RawData, doc=None) -> Optional[Dict[str, Any]]:
         """Extract a single idea from a sentence."""
         try:
             # Clean and normalize the sentence
@@ -181,7 +207,8 @@ class IdeaExtractor:
                 return None
             
             # Analyze the sentence
-            doc = self.nlp(sentence)
+            if doc is None:
+                doc = self.nlp(sentence)
             
             # Determine domain
             domain = self._classify_domain(sentence, doc)
@@ -202,7 +229,7 @@ class IdeaExtractor:
                 return None
             
             # Generate idea title and description
-            title = self._generate_idea_title(sentence, domain)
+            title = self._generate_idea_title(sentence, domain, doc)
             description = self._generate_idea_description(sentence, domain)
             
             # Generate thought process
@@ -235,11 +262,9 @@ class IdeaExtractor:
         # Count domain-specific keywords
         domain_scores = {}
         
-        for domain, keywords in self.opportunity_keywords.items():
-            score = 0
-            for keyword in keywords:
-                if keyword.lower() in sentence_lower:
-                    score += 1
+        for domain, keywords in self.classification_keywords.items():
+            # Substring match, so multi-word keywords and plurals still count
+            score = sum(1 for keyword in keywords if keyword in sentence_lower)
             
             if score > 0:
                 domain_scores[domain] = score
@@ -347,13 +372,14 @@ class IdeaExtractor:
         
         return min(confidence, 1.0)
     
-    def _generate_idea_title(self, sentence: str, domain: str) -> str:
+    def _generate_idea_title(self, sentence: str, domain: str, doc=None) -> str:
         """Generate a concise title for the idea."""
         # Clean the sentence
         sentence = sentence.strip()
         
-        # Extract key phrases from the sentence
-        doc = self.nlp(sentence)
+        # Extract key phrases from the sentence, reusing the caller's parse if given
+        if doc is None:
+            doc = self.nlp(sentence)
         
         # Look for noun phrases that represent interventions or opportunities
         noun_phrases = [chunk.text for chunk in doc.noun_chunks]
@@ -531,11 +557,7 @@ class IdeaExtractor:
         try:
             # Split into sentences
             sentences = sent_tokenize(paragraph)
-            
-            for sentence in sentences:
-                idea = self._extract_idea_from_sentence(sentence, raw_data)
-                if idea:
-                    ideas.append(idea)
+            ideas.extend(self._extract_ideas_from_sentences(sentences, raw_data))
             
             return ideas
             
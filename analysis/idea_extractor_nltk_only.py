@@ -6,7 +6,7 @@ import logging
 from typing import List, Dict, Any, Optional
 from collections import Counter
 import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.tokenize import sent_tokenize
 from nltk.corpus import stopwords, wordnet
 from nltk.tag import pos_tag
 from nltk.chunk import ne_chunk
@@ -16,6 +16,21 @@ import string
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Words and individual punctuation marks. Much cheaper than word_tokenize's
+# Treebank rules, and punctuation stays as separate tokens so POS tagging and
+# noun-phrase boundaries behave the same.
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Domain keywords, as sets for O(1) token lookups in _classify_domain
+DOMAIN_KEYWORDS = {
+    'health': frozenset(['health', 'medical', 'disease', 'treatment', 'patient', 'clinical', 'therapy', 'medicine', 'healthcare', 'hospital']),
+    'environment': frozenset(['environment', 'climate', 'sustainability', 'green', 'renewable', 'energy', 'pollution', 'conservation', 'ecosystem']),
+    'education': frozenset(['education', 'learning', 'teaching', 'student', 'school', 'university', 'academic', 'curriculum', 'pedagogy']),
+    'technology': frozenset(['technology', 'software', 'hardware', 'digital', 'computer', 'algorithm', 'data', 'artificial', 'intelligence']),
+    'social': frozenset(['social', 'community', 'poverty', 'inequality', 'justice', 'humanitarian', 'welfare', 'development']),
+    'research': frozenset(['research', 'study', 'analysis', 'investigation', 'experiment', 'methodology', 'scientific'])
+}
+
 class NLTKIdeaExtractor:
     """NLTK-only idea extractor for Mac Python 3.12 compatibility."""
     
@@ -43,23 +58,13 @@ class NLTKIdeaExtractor:
     
     def _classify_domain(self, text: str, doc=None) -> str:
         """Classify the domain of the text using NLTK."""
-        # Domain keywords
-        domain_keywords = {
-            'health': ['health', 'medical', 'disease', 'treatment', 'patient', 'clinical', 'therapy', 'medicine', 'healthcare', 'hospital'],
-            'environment': ['environment', 'climate', 'sustainability', 'green', 'renewable', 'energy', 'pollution', 'conservation', 'ecosystem'],
-            'education': ['education', 'learning', 'teaching', 'student', 'school', 'university', 'academic', 'curriculum', 'pedagogy'],
-            'technology': ['technology', 'software', 'hardware', 'digital', 'computer', 'algorithm', 'data', 'artificial', 'intelligence'],
-            'social': ['social', 'community', 'poverty', 'inequality', 'justice', 'humanitarian', 'welfare', 'development'],
-            'research': ['research', 'study', 'analysis', 'investigation', 'experiment', 'methodology', 'scientific']
-        }
-        
         # Tokenize and normalize text
-        tokens = word_tokenize(text.lower())
+        tokens = TOKEN_PATTERN.findall(text.lower())
         tokens = [token for token in tokens if token.isalnum()]
         
         # Count domain keywords
         domain_scores = {}
-        for domain, keywords in domain_keywords.items():
+        for domain, keywords in DOMAIN_KEYWORDS.items():
             score = sum(1 for token in tokens if token in keywords)
             domain_scores[domain] = score
         
@@ -79,7 +84,7 @@ class NLTKIdeaExtractor:
         
         for sentence in sentences:
             # Tokenize and POS tag
-            tokens = word_tokenize(sentence)
+            tokens = TOKEN_PATTERN.findall(sentence)
             pos_tags = pos_tag(tokens)
             
             # Extract noun phrases (simplified)
@@ -107,7 +112,7 @@ class NLTKIdeaExtractor:
     def _extract_entities(self, text: str) -> List[str]:
         """Extract named entities using NLTK."""
         try:
-            tokens = word_tokenize(text)
+            tokens = TOKEN_PATTERN.findall(text)
             pos_tags = pos_tag(tokens)
             named_entities = ne_chunk(pos_tags)
             
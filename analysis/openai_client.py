@@ -0,0 +1,34 @@
+"""
+Shared OpenAI client for the Philanthropic Ideas Generator.
+"""
+from functools import lru_cache
+from typing import Optional, Union
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Keep idle connections open so repeated small calls skip the TCP/TLS handshake
+CONNECTION_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+# Transport-level retries only cover failed connects; the SDK retries failed responses itself
+CONNECT_RETRIES = 2
+
+
+@lru_cache(maxsize=None)
+def get_openai_client(api_key: str) -> OpenAI:
+    """Return one OpenAI client per API key so its connection pool is reused."""
+    transport = httpx.HTTPTransport(http2=HTTP2_AVAILABLE, retries=CONNECT_RETRIES, limits=CONNECTION_LIMITS)
+    return OpenAI(api_key=api_key, http_client=httpx.Client(transport=transport, follow_redirects=True))
+
+
+def create_async_openai_client(api_key: str, base_url: Optional[Union[str, httpx.URL]] = None) -> AsyncOpenAI:
+    """Create an AsyncOpenAI client with the same transport; its pool is bound to the running event loop."""
+    transport = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, retries=CONNECT_RETRIES, limits=CONNECTION_LIMITS)
+    return AsyncOpenAI(api_key=api_key, base_url=base_url,
+                       http_client=httpx.AsyncClient(transport=transport, follow_redirects=True))
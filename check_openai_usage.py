@@ -5,7 +5,7 @@ Script to check OpenAI account usage and credits.
 import sys
 import os
 from datetime import datetime, timedelta
-from openai import OpenAI
+from analysis.openai_client import get_openai_client
 
 def check_openai_usage():
     """Check OpenAI account usage and credits."""
@@ -24,7 +24,7 @@ def check_openai_usage():
         return False
     
     try:
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         
         # Get current date and first day of current month
         now = datetime.now()
@@ -148,7 +148,7 @@ def check_api_key_status():
     
     # Test with a simple call
     try:
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": "test"}],
@@ -3,6 +3,7 @@ Configuration settings for the Philanthropic Ideas Generator.
 """
 from pydantic_settings import BaseSettings
 from typing import List, Dict, Optional
+from functools import lru_cache
 import os
 
 
@@ -27,6 +28,8 @@ class Settings(BaseSettings):
     SEMANTIC_SCHOLAR_RATE_LIMIT: int = 100
     CRUNCHBASE_RATE_LIMIT: int = 1000
     GOOGLE_RATE_LIMIT: int = 100
+    OPENAI_MAX_CONCURRENCY: int = 8  # in-flight OpenAI requests per extraction run
+    OPENAI_INGESTION_BATCH_SIZE: int = 5  # same-domain sources per 4o-mini ingestion call
     
     # Data sources configuration
     DATA_SOURCES: Dict[str, Dict] = {
@@ -166,6 +169,13 @@ class Settings(BaseSettings):
         ]
     }
     
+    # NLP
+    SPACY_BATCH_SIZE: int = 64  # texts per nlp.pipe batch
+    
+    # On-disk cache of AI synthesis responses, keyed by the normalized prompt
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL: int = 86400  # seconds
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -176,5 +186,14 @@ class Settings(BaseSettings):
         extra = "ignore"  # Allow extra fields from environment
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing the environment and .env only once.
+    
+    Call ``get_settings.cache_clear()`` after changing the environment to reload.
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -0,0 +1,62 @@
+"""
+Per-test output buffering shared by the test scripts.
+"""
+import sys
+import threading
+from contextlib import contextmanager
+from io import StringIO
+
+
+class _ThreadBufferedStdout:
+    """Stdout proxy that routes writes into the calling thread's buffer, if any."""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer if buffer is not None else self.stream).write(text)
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+_stdout_lock = threading.Lock()
+_stdout_proxy = None
+_active_captures = 0
+
+
+@contextmanager
+def capture_output():
+    """Buffer prints from the current thread and emit them in a single write.
+    
+    sys.stdout is swapped for a thread-aware proxy while any capture is active
+    and restored when the last one exits.
+    """
+    global _stdout_proxy, _active_captures
+    if sys.stdout.isatty():
+        yield None
+        return
+    
+    with _stdout_lock:
+        if _active_captures == 0:
+            _stdout_proxy = _ThreadBufferedStdout(sys.stdout)
+            sys.stdout = _stdout_proxy
+        _active_captures += 1
+        proxy = _stdout_proxy
+    
+    buffer = StringIO()
+    previous_buffer = getattr(proxy.local, "buffer", None)
+    proxy.local.buffer = buffer
+    try:
+        yield buffer
+    finally:
+        proxy.local.buffer = previous_buffer
+        with _stdout_lock:
+            (previous_buffer if previous_buffer is not None else proxy.stream).write(buffer.getvalue())
+            _active_captures -= 1
+            if _active_captures == 0:
+                if sys.stdout is proxy:
+                    sys.stdout = proxy.stream
+                _stdout_proxy = None
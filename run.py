@@ -190,9 +190,9 @@ def check_hybrid_extractor_status():
         
         # Import and test the hybrid extractor
         from analysis.hybrid_idea_extractor import HybridIdeaExtractor
-        from config.settings import Settings
+        from config.settings import get_settings
         
-        settings = Settings()
+        settings = get_settings()
         hybrid_extractor = HybridIdeaExtractor()
         
         print("\n🔧 Hybrid Extractor Status:")
@@ -346,8 +346,22 @@ class IdeaEvaluator:
         """Get the top-scoring ideas."""
         try:
             with db_manager.get_session() as session:
-                # Query ideas with their latest evaluation
-                query = session.query(ExtractedIdea, IdeaEvaluation).join(
+                # Query ideas with their latest evaluation, selecting only the
+                # columns we return (notes and thought process stay in the DB)
+                query = session.query(
+                    ExtractedIdea.id.label("idea_id"),
+                    ExtractedIdea.title,
+                    ExtractedIdea.description,
+                    ExtractedIdea.domain,
+                    ExtractedIdea.primary_metric,
+                    ExtractedIdea.idea_type,
+                    IdeaEvaluation.overall_score,
+                    IdeaEvaluation.impact_score,
+                    IdeaEvaluation.neglectedness_score,
+                    IdeaEvaluation.tractability_score,
+                    IdeaEvaluation.scalability_score,
+                    IdeaEvaluation.benchmark_comparison
+                ).join(
                     IdeaEvaluation, ExtractedIdea.id == IdeaEvaluation.idea_id
                 )
                 
@@ -357,25 +371,9 @@ class IdeaEvaluator:
                 if metric:
                     query = query.filter(ExtractedIdea.primary_metric == metric)
                 
-                # Get the latest evaluation for each idea
-                results = []
-                for idea, evaluation in query.order_by(IdeaEvaluation.overall_score.desc()).limit(limit):
-                    results.append({
-                        "idea_id": idea.id,
-                        "title": idea.title,
-                        "description": idea.description,
-                        "domain": idea.domain,
-                        "primary_metric": idea.primary_metric,
-                        "idea_type": idea.idea_type,
-                        "overall_score": evaluation.overall_score,
-                        "impact_score": evaluation.impact_score,
-                        "neglectedness_score": evaluation.neglectedness_score,
-                        "tractability_score": evaluation.tractability_score,
-                        "scalability_score": evaluation.scalability_score,
-                        "benchmark_comparison": evaluation.benchmark_comparison
-                    })
-                
-                return results
+                # Sorting and limiting happen in SQL so only `limit` rows are fetched
+                rows = query.order_by(IdeaEvaluation.overall_score.desc()).limit(limit)
+                return [dict(row._mapping) for row in rows]
                 
         except Exception as e:
             logger.error(f"Failed to get top ideas: {e}")
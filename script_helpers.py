@@ -0,0 +1,28 @@
+"""
+Helpers shared by the test scripts.
+"""
+import functools
+
+from output_capture import capture_output
+
+
+@functools.lru_cache(maxsize=1)
+def get_extractor():
+    """Build the hybrid extractor once per process and reuse it.
+    
+    The import is deferred so scripts that bail out early (e.g. without an API
+    key) never load spaCy/NLTK or the database.
+    """
+    from analysis.hybrid_idea_extractor import HybridIdeaExtractor
+    return HybridIdeaExtractor()
+
+
+def run_test(test_name: str, test_func) -> bool:
+    """Run a single test, treating an uncaught exception as a failure."""
+    with capture_output():
+        try:
+            print(f"\n{'='*20} {test_name} {'='*20}")
+            return test_func()
+        except Exception as e:
+            print(f"❌ {test_name} failed with exception: {e}")
+            return False
@@ -6,8 +6,19 @@ from datetime import datetime, timedelta
 import pickle
 import os
 
+from config.settings import settings
+
 logger = logging.getLogger(__name__)
 
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase a prompt and collapse whitespace for use as a cache key.
+    
+    Punctuation is kept: "4.5%" vs "45" or "-5" vs "5" must not share a cached response.
+    """
+    return " ".join(prompt.lower().split())
+
+
 class APICache:
     """Cache for API responses to improve performance and respect rate limits."""
     
@@ -220,5 +231,6 @@ class APICache:
             logger.warning(f"Error getting cache stats: {e}")
             return {"error": str(e)}
 
-# Global cache instance
+# Global cache instances
 api_cache = APICache()
+llm_cache = APICache(cache_dir=os.path.join(".cache", "llm"), default_ttl=settings.LLM_CACHE_TTL)
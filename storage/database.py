@@ -1,7 +1,7 @@
 """
 Database connection and session management for the Philanthropic Ideas Generator.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 from contextlib import contextmanager
@@ -20,6 +20,7 @@ class DatabaseManager:
     def __init__(self):
         self.engine = None
         self.SessionLocal = None
+        self.tables_created = False
         self._initialize_database()
     
     def _initialize_database(self):
@@ -57,9 +58,16 @@ class DatabaseManager:
             raise
     
     def create_tables(self):
-        """Create all database tables."""
+        """Create all database tables (skipped if already done by this manager)."""
+        if self.tables_created:
+            return
         try:
-            Base.metadata.create_all(bind=self.engine)
+            # One catalog query; create_all would check each table separately and
+            # never alters existing tables, so it only matters if some are missing
+            existing_tables = set(inspect(self.engine).get_table_names())
+            if not existing_tables.issuperset(Base.metadata.tables):
+                Base.metadata.create_all(bind=self.engine)
+            self.tables_created = True
             logger.info("Database tables created successfully")
         except Exception as e:
             logger.error(f"Failed to create database tables: {e}")
@@ -69,15 +77,23 @@ class DatabaseManager:
         """Drop all database tables (use with caution!)."""
         try:
             Base.metadata.drop_all(bind=self.engine)
+            self.tables_created = False
             logger.warning("Database tables dropped successfully")
         except Exception as e:
             logger.error(f"Failed to drop database tables: {e}")
             raise
     
     @contextmanager
-    def get_session(self) -> Generator[Session, None, None]:
-        """Get a database session with automatic cleanup."""
-        session = self.SessionLocal()
+    def get_session(self, **execution_options) -> Generator[Session, None, None]:
+        """Get a database session with automatic cleanup.
+        
+        Any keyword arguments are applied as engine execution options (e.g.
+        ``compiled_cache``) to every connection the session uses, across commits.
+        """
+        if execution_options:
+            session = self.SessionLocal(bind=self.engine.execution_options(**execution_options))
+        else:
+            session = self.SessionLocal()
         try:
             yield session
             session.commit()
@@ -124,4 +140,6 @@ def cleanup_database():
     """Clean up database connections."""
     if db_manager.engine:
         db_manager.engine.dispose()
+        # An in-memory SQLite database does not survive dispose()
+        db_manager.tables_created = False
         logger.info("Database connections cleaned up")
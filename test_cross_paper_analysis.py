@@ -10,10 +10,10 @@ from typing import List, Dict, Any
 # Add the project root to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from analysis.hybrid_idea_extractor import HybridIdeaExtractor
 from storage.database import db_manager
 from storage.models import RawData
 from config.settings import settings
+from script_helpers import get_extractor
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -26,7 +26,7 @@ def test_cross_paper_analysis():
     
     # Initialize the hybrid extractor (without OpenAI)
     print("🔧 Initializing Hybrid Extractor (Traditional NLP + Cross-Paper Analysis)...")
-    extractor = HybridIdeaExtractor(ai_provider="openai")  # Will fall back to traditional methods
+    extractor = get_extractor()  # Will fall back to traditional methods
     
     # Get raw data for testing
     print("\n📊 Getting raw data for cross-paper analysis...")
@@ -130,7 +130,7 @@ def test_specific_cross_paper_methods():
     print("\n🔬 Testing Specific Cross-Paper Analysis Methods")
     print("=" * 60)
     
-    extractor = HybridIdeaExtractor(ai_provider="openai")
+    extractor = get_extractor()
     
     with db_manager.get_session() as session:
         raw_data = session.query(RawData).limit(10).all()
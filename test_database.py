@@ -27,6 +27,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Compiled SQL shared by the CRUD, relationship and JSON tests so identical
+# INSERT/SELECT statements are only compiled once per run
+COMPILED_CACHE: Dict[Any, Any] = {}
+
 
 def test_database_connection():
     """Test basic database connection."""
@@ -64,7 +68,7 @@ def test_basic_operations():
     print("\n🔍 Testing basic CRUD operations...")
     
     try:
-        with db_manager.get_session() as session:
+        with db_manager.get_session(compiled_cache=COMPILED_CACHE) as session:
             # Test DataSource creation
             print("  Testing DataSource...")
             test_source = DataSource(
@@ -275,7 +279,7 @@ def test_relationships():
     print("\n🔍 Testing database relationships...")
     
     try:
-        with db_manager.get_session() as session:
+        with db_manager.get_session(compiled_cache=COMPILED_CACHE) as session:
             # Create test data with relationships
             source = DataSource(
                 name="relationship_test_source",
@@ -346,7 +350,7 @@ def test_json_fields():
     print("\n🔍 Testing JSON fields...")
     
     try:
-        with db_manager.get_session() as session:
+        with db_manager.get_session(compiled_cache=COMPILED_CACHE) as session:
             # Test JSON field in RawData
             test_data = RawData(
                 data_source_id=1,  # Assuming DataSource with ID 1 exists
@@ -4,7 +4,8 @@ Test script to verify that the API is using the hybrid extractor correctly.
 """
 import asyncio
 import logging
-from analysis.hybrid_idea_extractor import HybridIdeaExtractor
+
+from script_helpers import get_extractor
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -17,14 +18,14 @@ def test_hybrid_extractor():
     
     try:
         # Create hybrid extractor
-        hybrid_extractor = HybridIdeaExtractor()
+        hybrid_extractor = get_extractor()
         
         print(f"✅ Hybrid extractor created successfully")
         print(f"   AI Client: {'✅ Available' if hybrid_extractor.ai_client else '❌ Not available'}")
         print(f"   NLP Pipeline: {'✅ Available' if hasattr(hybrid_extractor, 'nlp') and hybrid_extractor.nlp else '❌ Not available'}")
         print(f"   Enhanced Keywords: ✅ {len(hybrid_extractor.enhanced_keywords)} domains")
         
-        # Test extraction method
+        # Test extraction method (the same pipeline the API calls)
         print("\n📝 Testing idea extraction...")
         ideas = hybrid_extractor.extract_ideas_from_raw_data()
         print(f"✅ Extracted {len(ideas)} ideas using hybrid extractor")
@@ -4,18 +4,23 @@ Comprehensive test script for the hybrid idea extractor.
 Tests all functionality including traditional NLP, AI synthesis (when available), and pattern recognition.
 """
 import asyncio
+import heapq
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, Any, List
 
+from sqlalchemy.orm import Session
+
 # Add the project root to the Python path
 sys.path.insert(0, '.')
 
 from analysis.hybrid_idea_extractor import HybridIdeaExtractor
 from storage.database import db_manager, init_database
 from storage.models import DataSource, RawData, ExtractedIdea
-from config.settings import Settings
+from config.settings import get_settings
+from script_helpers import run_test
 
 # Configure logging
 logging.basicConfig(
@@ -41,8 +46,7 @@ def create_test_data():
                 status="active"
             )
             session.add(test_source)
-            session.commit()
-            session.refresh(test_source)
+            session.flush()
             
             # Create sample raw data across different domains
             test_data = [
@@ -78,9 +82,8 @@ def create_test_data():
                 }
             ]
             
-            raw_data_items = []
-            for data in test_data:
-                raw_data = RawData(
+            raw_data_items = [
+                RawData(
                     data_source_id=test_source.id,
                     content_type="paper",
                     title=data["title"],
@@ -91,17 +94,20 @@ def create_test_data():
                     keywords=data["keywords"],
                     metadata_json={"domain": data["domain"]}
                 )
-                session.add(raw_data)
-                raw_data_items.append(raw_data)
+                for data in test_data
+            ]
+            session.add_all(raw_data_items)
             
+            # A single flush assigns all primary keys; read them before commit
+            # expires the instances
+            session.flush()
+            source_id = test_source.id
+            raw_data_ids = [item.id for item in raw_data_items]
+            assert all(item_id is not None for item_id in raw_data_ids), "flush did not assign ids"
             session.commit()
             
-            # Refresh to get IDs
-            for item in raw_data_items:
-                session.refresh(item)
-            
-            print(f"✅ Created {len(raw_data_items)} test data items")
-            return test_source.id, [item.id for item in raw_data_items]
+            print(f"✅ Created {len(raw_data_ids)} test data items")
+            return source_id, raw_data_ids
             
     except Exception as e:
         print(f"❌ Failed to create test data: {e}")
@@ -113,28 +119,36 @@ def test_hybrid_extractor_initialization():
     print("\n🔧 Testing Hybrid Extractor Initialization...")
     
     try:
-    # Check configuration
-    settings = Settings()
+        # Check configuration
+        settings = get_settings()
         api_key_available = bool(settings.OPENAI_API_KEY)
         print(f"OpenAI API Key: {'✅ Set' if api_key_available else '❌ Not set'}")
-    
-    # Initialize hybrid extractor
-    hybrid_extractor = HybridIdeaExtractor()
-    
+        
+        # Initialize hybrid extractor
+        hybrid_extractor = HybridIdeaExtractor()
+        
         # Test basic properties
-    print(f"AI Client: {'✅ Available' if hybrid_extractor.ai_client else '❌ Not available'}")
-    print(f"Enhanced Keywords: {len(hybrid_extractor.enhanced_keywords)} domains")
-    
+        print(f"AI Client: {'✅ Available' if hybrid_extractor.ai_client else '❌ Not available'}")
+        print(f"Enhanced Keywords: {len(hybrid_extractor.enhanced_keywords)} domains")
+        
         # Test NLP initialization
         if hasattr(hybrid_extractor, 'nlp') and hybrid_extractor.nlp:
             print("✅ NLP pipeline initialized")
         else:
             print("❌ NLP pipeline not initialized")
-    
-    # Show enhanced keywords
-    print("\n🔑 Enhanced Keywords by Domain:")
-    for domain, keywords in hybrid_extractor.enhanced_keywords.items():
-        print(f"  {domain}: {len(keywords)} keywords")
+        
+        # Unused spaCy components should not be loaded (NLTK fallback has no pipeline)
+        pipe_names = getattr(hybrid_extractor.nlp, 'pipe_names', None)
+        if pipe_names is not None:
+            print(f"NLP components: {', '.join(pipe_names)}")
+            if "lemmatizer" in pipe_names:
+                print("❌ Unused lemmatizer is still loaded")
+                return False
+        
+        # Show enhanced keywords
+        print("\n🔑 Enhanced Keywords by Domain:")
+        for domain, keywords in hybrid_extractor.enhanced_keywords.items():
+            print(f"  {domain}: {len(keywords)} keywords")
             print(f"    Sample: {', '.join(keywords[:3])}...")
         
         return True
@@ -170,7 +184,7 @@ def test_traditional_nlp_extraction(hybrid_extractor: HybridIdeaExtractor, raw_d
         return False
 
 
-def test_synthesis_functionality(hybrid_extractor: HybridIdeaExtractor, raw_data_ids: List[int]):
+def test_synthesis_functionality(hybrid_extractor: HybridIdeaExtractor, ideas: List[Dict[str, Any]]):
     """Test synthesis functionality (AI or traditional fallback)."""
     print("\n🧠 Testing Synthesis Functionality...")
     
@@ -180,9 +194,6 @@ def test_synthesis_functionality(hybrid_extractor: HybridIdeaExtractor, raw_data
         print("📚 Using traditional synthesis fallback")
     
     try:
-        # Test synthesis with multiple sources
-        ideas = hybrid_extractor.extract_ideas_from_raw_data()
-        
         # Filter for synthesized ideas
         synthesized_ideas = [idea for idea in ideas if idea.get('extraction_method') in ['ai_synthesis', 'traditional_synthesis']]
         
@@ -206,14 +217,11 @@ def test_synthesis_functionality(hybrid_extractor: HybridIdeaExtractor, raw_data
         return False
 
 
-def test_pattern_recognition(hybrid_extractor: HybridIdeaExtractor, raw_data_ids: List[int]):
+def test_pattern_recognition(hybrid_extractor: HybridIdeaExtractor, ideas: List[Dict[str, Any]]):
     """Test pattern recognition and gap identification."""
     print("\n🔍 Testing Pattern Recognition...")
     
     try:
-        # Test pattern recognition
-        ideas = hybrid_extractor.extract_ideas_from_raw_data()
-        
         # Filter for pattern-based ideas
         pattern_ideas = [idea for idea in ideas if idea.get('extraction_method') == 'pattern_recognition']
         
@@ -235,33 +243,31 @@ def test_pattern_recognition(hybrid_extractor: HybridIdeaExtractor, raw_data_ids
         return False
 
 
-def test_idea_ranking_and_filtering(hybrid_extractor: HybridIdeaExtractor, raw_data_ids: List[int]):
+def test_idea_ranking_and_filtering(hybrid_extractor: HybridIdeaExtractor, ideas: List[Dict[str, Any]]):
     """Test idea ranking and filtering functionality."""
     print("\n🏆 Testing Idea Ranking and Filtering...")
     
     try:
-        # Extract ideas
-        ideas = hybrid_extractor.extract_ideas_from_raw_data()
-        
         print(f"Total ideas extracted: {len(ideas)}")
         
         if ideas:
+            # Pull the fields we need into columns once instead of per-check dict lookups
+            titles = [idea.get('title') or '' for idea in ideas]
+            scores = [idea.get('enhanced_score') for idea in ideas]
+            
             # Check for enhanced scoring
-            scored_ideas = [idea for idea in ideas if 'enhanced_score' in idea]
-            print(f"Ideas with enhanced scores: {len(scored_ideas)}")
+            scored_indices = [i for i, score in enumerate(scores) if score is not None]
+            print(f"Ideas with enhanced scores: {len(scored_indices)}")
             
-            if scored_ideas:
+            if scored_indices:
                 # Show top-ranked ideas
-                top_ideas = sorted(scored_ideas, key=lambda x: x['enhanced_score'], reverse=True)[:3]
+                top_indices = heapq.nlargest(3, scored_indices, key=scores.__getitem__)
                 print(f"\n🏆 Top 3 Ranked Ideas:")
-                for i, idea in enumerate(top_ideas, 1):
-                    print(f"  {i}. {idea.get('title', 'N/A')} (Score: {idea.get('enhanced_score', 'N/A'):.3f})")
+                for rank, i in enumerate(top_indices, 1):
+                    print(f"  {rank}. {titles[i] or 'N/A'} (Score: {scores[i]:.3f})")
             
             # Check for duplicate removal
-            unique_titles = set()
-            for idea in ideas:
-                title = idea.get('title', '').lower()
-                unique_titles.add(title)
+            unique_titles = set(map(str.casefold, titles))
             
             print(f"Unique ideas (after deduplication): {len(unique_titles)}")
         
@@ -272,33 +278,29 @@ def test_idea_ranking_and_filtering(hybrid_extractor: HybridIdeaExtractor, raw_d
         return False
 
 
-def test_database_saving(hybrid_extractor: HybridIdeaExtractor, raw_data_ids: List[int]):
+def test_database_saving(hybrid_extractor: HybridIdeaExtractor, ideas: List[Dict[str, Any]], session: Session):
     """Test saving extracted ideas to database."""
     print("\n💾 Testing Database Saving...")
     
     try:
-        # Extract ideas
-        ideas = hybrid_extractor.extract_ideas_from_raw_data()
-        
         if ideas:
             # Save to database
             saved_count = hybrid_extractor.save_extracted_ideas(ideas)
             print(f"Saved {saved_count} ideas to database")
             
             # Verify in database
-            with db_manager.get_session() as session:
-                db_ideas = session.query(ExtractedIdea).all()
-                print(f"Total ideas in database: {len(db_ideas)}")
-                
-                # Show sample saved idea
-                if db_ideas:
-                    sample_db_idea = db_ideas[0]
-                    print(f"\n💾 Sample Saved Idea:")
-                    print(f"  ID: {sample_db_idea.id}")
-                    print(f"  Title: {sample_db_idea.title}")
-                    print(f"  Domain: {sample_db_idea.domain}")
-                    print(f"  Method: {sample_db_idea.extraction_method}")
-                    print(f"  Created: {sample_db_idea.created_at}")
+            total_ideas = session.query(ExtractedIdea).count()
+            print(f"Total ideas in database: {total_ideas}")
+            
+            # Show the most recently saved idea
+            sample_db_idea = session.query(ExtractedIdea).order_by(ExtractedIdea.id.desc()).first()
+            if sample_db_idea:
+                print(f"\n💾 Sample Saved Idea:")
+                print(f"  ID: {sample_db_idea.id}")
+                print(f"  Title: {sample_db_idea.title}")
+                print(f"  Domain: {sample_db_idea.domain}")
+                print(f"  Method: {sample_db_idea.extraction_method}")
+                print(f"  Created: {sample_db_idea.created_at}")
             
             return saved_count > 0
         else:
@@ -318,10 +320,15 @@ def test_domain_specific_extraction(hybrid_extractor: HybridIdeaExtractor, raw_d
         # Test extraction for specific domains
         domains = ["health", "wellbeing", "education"]
         
-        for domain in domains:
+        # Each call opens its own session and is dominated by DB/OpenAI I/O,
+        # so the domains can be extracted concurrently
+        with ThreadPoolExecutor(max_workers=len(domains)) as executor:
+            results = dict(zip(domains, executor.map(
+                lambda d: hybrid_extractor.extract_ideas_from_raw_data(domain=d), domains
+            )))
+        
+        for domain, domain_ideas in results.items():
             print(f"\n  Testing {domain} domain...")
-            domain_ideas = hybrid_extractor.extract_ideas_from_raw_data(domain=domain)
-            
             print(f"    Extracted {len(domain_ideas)} ideas for {domain}")
             
             if domain_ideas:
@@ -345,16 +352,17 @@ def cleanup_test_data(source_id: int, raw_data_ids: List[int]):
             # Delete extracted ideas
             ideas_deleted = session.query(ExtractedIdea).filter(
                 ExtractedIdea.raw_data_id.in_(raw_data_ids)
-            ).delete()
+            ).delete(synchronize_session=False)
             print(f"Deleted {ideas_deleted} extracted ideas")
             
             # Delete raw data
-            for raw_data_id in raw_data_ids:
-                session.query(RawData).filter(RawData.id == raw_data_id).delete()
-            print(f"Deleted {len(raw_data_ids)} raw data items")
+            raw_data_deleted = session.query(RawData).filter(
+                RawData.id.in_(raw_data_ids)
+            ).delete(synchronize_session=False)
+            print(f"Deleted {raw_data_deleted} raw data items")
             
             # Delete data source
-            session.query(DataSource).filter(DataSource.id == source_id).delete()
+            session.query(DataSource).filter(DataSource.id == source_id).delete(synchronize_session=False)
             print(f"Deleted data source {source_id}")
             
             session.commit()
@@ -381,26 +389,40 @@ def main():
     # Initialize hybrid extractor
     hybrid_extractor = HybridIdeaExtractor()
     
+    # Run the full extraction once; synthesis, pattern, ranking and saving
+    # tests all inspect the same result
+    all_ideas = hybrid_extractor.extract_ideas_from_raw_data()
+    
     # Run tests
     tests = [
         ("Initialization", lambda: test_hybrid_extractor_initialization()),
         ("Traditional NLP Extraction", lambda: test_traditional_nlp_extraction(hybrid_extractor, raw_data_ids)),
-        ("Synthesis Functionality", lambda: test_synthesis_functionality(hybrid_extractor, raw_data_ids)),
-        ("Pattern Recognition", lambda: test_pattern_recognition(hybrid_extractor, raw_data_ids)),
-        ("Idea Ranking and Filtering", lambda: test_idea_ranking_and_filtering(hybrid_extractor, raw_data_ids)),
-        ("Database Saving", lambda: test_database_saving(hybrid_extractor, raw_data_ids)),
+        ("Synthesis Functionality", lambda: test_synthesis_functionality(hybrid_extractor, all_ideas)),
+        ("Pattern Recognition", lambda: test_pattern_recognition(hybrid_extractor, all_ideas)),
+        ("Idea Ranking and Filtering", lambda: test_idea_ranking_and_filtering(hybrid_extractor, all_ideas)),
+        ("Database Saving", lambda: test_database_saving(hybrid_extractor, all_ideas, session)),
         ("Domain-Specific Extraction", lambda: test_domain_specific_extraction(hybrid_extractor, raw_data_ids))
     ]
     
-    results = []
-    for test_name, test_func in tests:
-        try:
-            print(f"\n{'='*20} {test_name} {'='*20}")
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ {test_name} failed with exception: {e}")
-            results.append((test_name, False))
+    # Only database saving mutates state; the read-only tests are I/O bound
+    # (DB + OpenAI) and run concurrently, each through its own sessions
+    serial_test_names = {"Database Saving"}
+    parallel_tests = [(name, func) for name, func in tests if name not in serial_test_names]
+    serial_tests = [(name, func) for name, func in tests if name in serial_test_names]
+    
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {executor.submit(run_test, name, func): name for name, func in parallel_tests}
+        for future in as_completed(futures):
+            outcomes[futures[future]] = future.result()
+    
+    # Read-only verification in the serial tests shares one session; fixture
+    # setup/cleanup and the extractor's own writes keep separate transactions
+    with db_manager.get_session() as session:
+        for test_name, test_func in serial_tests:
+            outcomes[test_name] = run_test(test_name, test_func)
+    
+    results = [(test_name, outcomes[test_name]) for test_name, _ in tests]
     
     # Cleanup
     cleanup_test_data(source_id, raw_data_ids)
@@ -5,44 +5,58 @@ Test script to verify the hybrid LLM synthesis is working properly.
 import os
 import sys
 import logging
-from typing import List, Dict, Any
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy.orm import load_only
 
 # Add the project root to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from analysis.hybrid_idea_extractor import HybridIdeaExtractor
+from analysis.openai_client import get_openai_client
 from storage.database import db_manager
 from storage.models import RawData
 from config.settings import settings
+from script_helpers import get_extractor
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def test_hybrid_llm_synthesis():
-    """Test the hybrid LLM synthesis functionality."""
+def test_hybrid_llm_synthesis(extractor: Optional[HybridIdeaExtractor] = None,
+                              api_key_valid: Optional[bool] = None):
+    """Test the hybrid LLM synthesis functionality.
+    
+    main() passes the extractor and key check it already has; run standalone
+    (e.g. under pytest) both are computed here.
+    """
     print("🧪 Testing Hybrid LLM Synthesis")
     print("=" * 60)
     
-    # Initialize the hybrid extractor
-    print("🔧 Initializing Hybrid Extractor...")
-    extractor = HybridIdeaExtractor(ai_provider="openai")
+    if extractor is None:
+        extractor = get_extractor()
+    if api_key_valid is None:
+        api_key_valid = test_openai_api_key()
     
-    # Check AI client status
-    if extractor.ai_client:
-        print("✅ AI client initialized successfully")
-        print(f"   Provider: {extractor.ai_provider}")
-    else:
-        print("❌ AI client not available")
+    # The key was already validated by test_openai_api_key, no need to re-check the client
+    if not api_key_valid:
+        print("❌ OpenAI API key not valid")
         print("   This means the hybrid extractor will fall back to traditional NLP only")
-        print("   To enable LLM synthesis, you need a valid OpenAI API key")
         return False
+    print(f"✅ Using validated API key (provider: {extractor.ai_provider})")
     
     # Get some raw data for testing
     print("\n📊 Getting raw data for synthesis...")
     with db_manager.get_session() as session:
-        # Get a few items from different domains
-        raw_data = session.query(RawData).limit(10).all()
+        # Get a few items from different domains, loading only the columns
+        # synthesis reads and detaching them so the commit on exit does not
+        # expire them (they are used after the session closes)
+        raw_data = session.query(RawData).options(
+            load_only(RawData.id, RawData.title, RawData.abstract)
+        ).limit(10).all()
+        session.expunge_all()
         
         if not raw_data:
             print("❌ No raw data found in database")
@@ -91,17 +105,14 @@ def test_hybrid_llm_synthesis():
             print(f"✅ Generated {len(all_ideas)} total ideas using hybrid approach")
             
             # Count by extraction method
-            method_counts = {}
-            for idea in all_ideas:
-                method = idea.get('extraction_method', 'unknown')
-                method_counts[method] = method_counts.get(method, 0) + 1
+            method_counts = Counter(idea.get('extraction_method', 'unknown') for idea in all_ideas)
             
             print("\n📈 Ideas by extraction method:")
             for method, count in method_counts.items():
                 print(f"   {method}: {count} ideas")
             
             # Show some high-confidence ideas
-            high_conf_ideas = [idea for idea in all_ideas if idea.get('confidence_score', 0) > 0.7]
+            high_conf_ideas = [idea for idea in all_ideas if (idea.get('confidence_score') or 0) > 0.7]
             if high_conf_ideas:
                 print(f"\n🏆 High-confidence ideas ({len(high_conf_ideas)}):")
                 for i, idea in enumerate(high_conf_ideas[:3], 1):
@@ -131,8 +142,7 @@ def test_openai_api_key():
     
     # Test the API key
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         
         # Simple test call
         response = client.chat.completions.create(
@@ -154,8 +164,13 @@ def main():
     print("🚀 Testing Hybrid LLM Synthesis")
     print("=" * 60)
     
-    # First test the API key
-    api_key_valid = test_openai_api_key()
+    # Validate the API key in the background while the extractor loads its
+    # NLP pipeline, so the network round-trip overlaps with model loading
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        api_key_future = executor.submit(test_openai_api_key)
+        print("🔧 Initializing Hybrid Extractor...")
+        extractor = get_extractor()
+        api_key_valid = api_key_future.result()
     
     if not api_key_valid:
         print("\n💡 To enable LLM synthesis, you need to:")
@@ -165,7 +180,7 @@ def main():
         return
     
     # Test the hybrid synthesis
-    success = test_hybrid_llm_synthesis()
+    success = test_hybrid_llm_synthesis(extractor, api_key_valid)
     
     if success:
         print("\n🎉 All tests passed! The hybrid LLM synthesis is working correctly.")
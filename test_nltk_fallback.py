@@ -2,22 +2,32 @@
 """
 Test NLTK Fallback - spaCy-free testing
 """
+import functools
 import sys
 import os
 
 # Add the project root to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-def test_nltk_extractor():
+from output_capture import capture_output
+from script_helpers import get_extractor
+
+@functools.lru_cache(maxsize=1)
+def get_nltk_extractor():
+    """Return the NLTK extractor, reusing the hybrid's own fallback when spaCy is missing."""
+    from analysis.idea_extractor_nltk_only import NLTKIdeaExtractor
+    
+    hybrid = get_extractor()
+    return hybrid.nlp if isinstance(hybrid.nlp, NLTKIdeaExtractor) else NLTKIdeaExtractor()
+
+def test_nltk_extractor(extractor=None):
     """Test the NLTK-only extractor."""
     print("🧪 Testing NLTK-Only Extractor")
     print("=" * 40)
     
     try:
-        from analysis.idea_extractor_nltk_only import NLTKIdeaExtractor
-        
-        # Create extractor
-        extractor = NLTKIdeaExtractor()
+        if extractor is None:
+            extractor = get_nltk_extractor()
         print("✅ NLTK extractor created successfully")
         
         # Test text
@@ -45,16 +55,14 @@ def test_nltk_extractor():
         print(f"❌ NLTK extractor test failed: {e}")
         return False
 
-def test_hybrid_without_spacy():
+def test_hybrid_without_spacy(extractor=None):
     """Test hybrid extractor without spaCy."""
     print("\n🧪 Testing Hybrid Extractor (spaCy-free)")
     print("=" * 45)
     
     try:
-        from analysis.hybrid_idea_extractor import HybridIdeaExtractor
-        
-        # Create hybrid extractor (should use NLTK fallback)
-        extractor = HybridIdeaExtractor(ai_provider="openai")
+        if extractor is None:
+            extractor = get_extractor()
         print("✅ Hybrid extractor created successfully")
         
         # Test basic functionality
@@ -74,11 +82,11 @@ def main():
     print("🍎 Mac Python 3.12 spaCy-Free Test")
     print("=" * 40)
     
-    # Test NLTK extractor
-    nltk_ok = test_nltk_extractor()
-    
-    # Test hybrid extractor
-    hybrid_ok = test_hybrid_without_spacy()
+    # Both tests share the cached hybrid; without spaCy its nlp already is the NLTK extractor
+    with capture_output():
+        nltk_ok = test_nltk_extractor()
+    with capture_output():
+        hybrid_ok = test_hybrid_without_spacy()
     
     print("\n🎯 Test Results")
     print("=" * 20)
@@ -2,23 +2,125 @@
 """
 Test script for OpenAI 4o-mini and 4o models integration.
 """
+import asyncio
+import json
 import sys
 import os
 import logging
-from typing import List, Dict, Any
+import tempfile
+import time
+from typing import TYPE_CHECKING, List, Dict, Any
 
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from analysis.hybrid_idea_extractor import HybridIdeaExtractor
-from storage.database import db_manager
-from storage.models import RawData
+# The extractor and database modules are imported inside test_openai_models, so a
+# missing API key fails fast without loading spaCy/NLTK/SQLAlchemy
 from config.settings import settings
+from analysis.openai_client import create_async_openai_client
+from output_capture import capture_output
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from analysis.hybrid_idea_extractor import HybridIdeaExtractor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Throttle limits for batched requests (keep below the account's rate limits)
+MAX_REQUESTS_PER_MINUTE = 500
+MAX_TOKENS_PER_MINUTE = 200_000
+
+def print_ideas(ideas: List[Dict[str, Any]]):
+    """Print a short summary of each idea."""
+    for i, idea in enumerate(ideas, 1):
+        print(f"   Idea {i}: {idea.get('title', 'No title')}")
+        print(f"   Method: {idea.get('extraction_method', 'Unknown')}")
+        print(f"   Confidence: {idea.get('confidence_score', 0):.2f}")
+
+async def parallel_process_api_requests(client: "AsyncOpenAI", requests: List[Dict[str, Any]],
+                                       max_requests_per_minute: float = MAX_REQUESTS_PER_MINUTE,
+                                       max_tokens_per_minute: float = MAX_TOKENS_PER_MINUTE,
+                                       max_attempts: int = 3,
+                                       max_concurrency: int = 10) -> str:
+    """Send chat completion requests concurrently under RPM/TPM limits.
+    
+    Follows the OpenAI cookbook's api_request_parallel_processor: each request
+    dict holds the request body plus optional "metadata", capacity refills
+    continuously, failures are retried with exponential backoff, and results
+    are written to a JSONL file whose path is returned. The endpoint and
+    credentials come from ``client``, so a custom base URL is respected.
+    """
+    import aiohttp
+    
+    chat_completions_url = str(client.base_url.join("chat/completions"))
+    available_requests = max_requests_per_minute
+    available_tokens = max_tokens_per_minute
+    last_update = time.monotonic()
+    capacity_lock = asyncio.Lock()
+    
+    async def acquire_capacity(token_estimate: int):
+        nonlocal available_requests, available_tokens, last_update
+        while True:
+            async with capacity_lock:
+                now = time.monotonic()
+                elapsed = now - last_update
+                last_update = now
+                available_requests = min(max_requests_per_minute,
+                                         available_requests + max_requests_per_minute * elapsed / 60)
+                available_tokens = min(max_tokens_per_minute,
+                                       available_tokens + max_tokens_per_minute * elapsed / 60)
+                if available_requests >= 1 and available_tokens >= token_estimate:
+                    available_requests -= 1
+                    available_tokens -= token_estimate
+                    return
+            await asyncio.sleep(0.05)
+    
+    async def process_request(session: aiohttp.ClientSession, index: int, request: Dict[str, Any]) -> Dict[str, Any]:
+        body = {key: value for key, value in request.items() if key != "metadata"}
+        # Rough prompt estimate (~4 chars per token) plus the completion budget
+        token_estimate = sum(len(m["content"]) for m in body["messages"]) // 4 + body.get("max_tokens", 0)
+        errors = []
+        for attempt in range(1, max_attempts + 1):
+            await acquire_capacity(token_estimate)
+            try:
+                async with session.post(chat_completions_url, json=body) as response:
+                    if response.status == 200:
+                        return {"index": index, "metadata": request.get("metadata"), "response": await response.json()}
+                    try:
+                        errors.append((await response.json(content_type=None))["error"]["message"])
+                    except (ValueError, KeyError, TypeError):
+                        errors.append(f"HTTP {response.status}")
+                    # Only rate limits and server errors are transient; other 4xx fail the same way again
+                    if response.status != 429 and response.status < 500:
+                        break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                errors.append(str(e))
+            if attempt < max_attempts:
+                await asyncio.sleep(2 ** (attempt - 1))
+        logger.warning(f"Request {index} failed after {attempt} attempt(s): {errors[-1]}")
+        return {"index": index, "metadata": request.get("metadata"), "errors": errors}
+    
+    fd, results_path = tempfile.mkstemp(prefix="openai_results_", suffix=".jsonl")
+    connector = aiohttp.TCPConnector(limit=max_concurrency)
+    async with aiohttp.ClientSession(connector=connector, headers=client.auth_headers) as session:
+        with os.fdopen(fd, "w") as results_file:
+            for result in asyncio.as_completed([process_request(session, i, r) for i, r in enumerate(requests)]):
+                results_file.write(json.dumps(await result) + "\n")
+    
+    return results_path
+
+async def run_model_calls(extractor: "HybridIdeaExtractor", test_text: str, test_context: str,
+                          item_requests: List[Dict[str, Any]]) -> List[Any]:
+    """Run the 4o-mini ingestion, 4o synthesis and database item requests concurrently."""
+    async with create_async_openai_client(extractor.ai_client.api_key, extractor.ai_client.base_url) as client:
+        return await asyncio.gather(
+            extractor._call_ai_for_data_ingestion_async(client, test_text, "health"),
+            extractor._call_ai_for_synthesis_async(client, test_context, "health"),
+            parallel_process_api_requests(client, item_requests),
+        )
+
 def test_openai_models():
     """Test the OpenAI 4o-mini and 4o models integration."""
     print("🧪 Testing OpenAI 4o-mini and 4o Models Integration")
@@ -34,6 +136,10 @@ def test_openai_models():
     
     # Initialize the hybrid extractor
     try:
+        from analysis.hybrid_idea_extractor import HybridIdeaExtractor
+        from storage.database import db_manager
+        from storage.models import RawData
+        
         extractor = HybridIdeaExtractor(ai_provider="openai")
         print("✅ HybridIdeaExtractor initialized successfully")
         
@@ -51,8 +157,6 @@ def test_openai_models():
         print(f"❌ Failed to initialize HybridIdeaExtractor: {e}")
         return False
     
-    # Test data ingestion with 4o-mini
-    print("\n🔍 Testing 4o-mini for data ingestion...")
     test_text = """
     A recent study on malaria prevention in sub-Saharan Africa found that 
     distributing insecticide-treated bed nets reduced malaria incidence by 45% 
@@ -60,21 +164,6 @@ def test_openai_models():
     net and lasted for 3 years, making it highly cost-effective.
     """
     
-    try:
-        ingestion_ideas = extractor._call_ai_for_data_ingestion(test_text, "health")
-        print(f"✅ 4o-mini data ingestion successful: {len(ingestion_ideas)} ideas generated")
-        
-        for i, idea in enumerate(ingestion_ideas, 1):
-            print(f"   Idea {i}: {idea.get('title', 'No title')}")
-            print(f"   Method: {idea.get('extraction_method', 'Unknown')}")
-            print(f"   Confidence: {idea.get('confidence_score', 0):.2f}")
-        
-    except Exception as e:
-        print(f"❌ 4o-mini data ingestion failed: {e}")
-        return False
-    
-    # Test idea synthesis with 4o
-    print("\n🧠 Testing 4o for idea synthesis...")
     test_context = """
     Source 1: Malaria Prevention with Bed Nets
     Abstract: Study shows 45% reduction in malaria with $5 bed nets...
@@ -86,21 +175,9 @@ def test_openai_models():
     Abstract: SMS reminders increased vaccination rates by 25%...
     """
     
-    try:
-        synthesis_ideas = extractor._call_ai_for_synthesis(test_context, "health")
-        print(f"✅ 4o idea synthesis successful: {len(synthesis_ideas)} ideas generated")
-        
-        for i, idea in enumerate(synthesis_ideas, 1):
-            print(f"   Idea {i}: {idea.get('title', 'No title')}")
-            print(f"   Method: {idea.get('extraction_method', 'Unknown')}")
-            print(f"   Confidence: {idea.get('confidence_score', 0):.2f}")
-        
-    except Exception as e:
-        print(f"❌ 4o idea synthesis failed: {e}")
-        return False
-    
-    # Test with real data from database
-    print("\n📊 Testing with real database data...")
+    # Pick a real item from the database for the third call
+    print("\n📊 Loading real database data...")
+    item_requests = []
     try:
         with db_manager.get_session() as session:
             # Get a few raw data items
@@ -109,19 +186,17 @@ def test_openai_models():
             if raw_data_items:
                 print(f"✅ Found {len(raw_data_items)} raw data items for testing")
                 
-                # Test extraction on one item
-                test_item = raw_data_items[0]
-                print(f"   Testing with: {test_item.title[:50]}...")
-                
-                # Test AI ingestion on this item
-                text_content = f"{test_item.title} {test_item.abstract or ''}"
-                domain = extractor._classify_domain(text_content, extractor.nlp(text_content))
-                
-                if domain:
-                    ai_ideas = extractor._call_ai_for_data_ingestion(text_content, domain)
-                    print(f"   ✅ AI ingestion generated {len(ai_ideas)} ideas for {domain} domain")
-                else:
-                    print("   ⚠️ Could not classify domain for test item")
+                # Parse all items in one batched nlp.pipe pass
+                docs = extractor._parse_sources(raw_data_items)
+                for test_item in raw_data_items:
+                    text_content = f"{test_item.title} {test_item.abstract or ''}"
+                    domain = extractor._classify_domain(text_content, docs[test_item.id])
+                    if not domain:
+                        print(f"   ⚠️ Could not classify domain for: {test_item.title[:50]}...")
+                        continue
+                    request = extractor._ingestion_request_params(text_content, domain)
+                    request["metadata"] = {"raw_data_id": test_item.id, "domain": domain}
+                    item_requests.append(request)
             else:
                 print("⚠️ No raw data found in database")
                 
@@ -129,6 +204,46 @@ def test_openai_models():
         print(f"❌ Database test failed: {e}")
         return False
     
+    # The calls are independent, so run them concurrently
+    print("\n🚀 Running 4o-mini ingestion, 4o synthesis and database item requests concurrently...")
+    try:
+        ingestion_ideas, synthesis_ideas, results_path = asyncio.run(
+            run_model_calls(extractor, test_text, test_context, item_requests)
+        )
+    except Exception as e:
+        print(f"❌ Concurrent model calls failed: {e}")
+        return False
+    
+    print("\n🔍 4o-mini data ingestion:")
+    print(f"✅ 4o-mini data ingestion successful: {len(ingestion_ideas)} ideas generated")
+    print_ideas(ingestion_ideas)
+    
+    print("\n🧠 4o idea synthesis:")
+    print(f"✅ 4o idea synthesis successful: {len(synthesis_ideas)} ideas generated")
+    print_ideas(synthesis_ideas)
+    
+    print("\n📊 Database item ingestion:")
+    with open(results_path) as results_file:
+        item_results = [json.loads(line) for line in results_file]
+    os.remove(results_path)
+    
+    if len(item_results) != len(item_requests):
+        print(f"❌ Expected {len(item_requests)} database item results, got {len(item_results)}")
+        return False
+    
+    failed = [result for result in item_results if "errors" in result]
+    for result in item_results:
+        if "errors" in result:
+            continue
+        domain = result["metadata"]["domain"]
+        ai_ideas = extractor._parse_ingestion_response(
+            result["response"]["choices"][0]["message"]["content"], domain
+        )
+        print(f"   ✅ AI ingestion generated {len(ai_ideas)} ideas for {domain} domain")
+    if failed:
+        print(f"❌ {len(failed)} database item requests failed: {failed[0]['errors'][-1]}")
+        return False
+    
     print("\n🎉 All tests completed successfully!")
     print("✅ OpenAI 4o-mini and 4o models are working correctly")
     return True
@@ -151,11 +266,13 @@ def test_cost_efficiency():
 if __name__ == "__main__":
     print("🚀 OpenAI 4o Models Integration Test")
     print("=" * 50)
-    
-    success = test_openai_models()
-    
+
+    with capture_output():
+        success = test_openai_models()
+
     if success:
-        test_cost_efficiency()
+        with capture_output():
+            test_cost_efficiency()
         print("\n✅ Integration test completed successfully!")
         print("The hybrid extractor is ready to use with OpenAI 4o models.")
     else:
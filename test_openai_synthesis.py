@@ -2,17 +2,20 @@
 """
 Focused test for OpenAI API integration and AI synthesis functionality.
 """
+import functools
 import sys
 import logging
 from datetime import datetime
 
+from sqlalchemy import insert
+
 # Add the project root to the Python path
 sys.path.insert(0, '.')
 
-from analysis.hybrid_idea_extractor import HybridIdeaExtractor
 from storage.database import db_manager, init_database
 from storage.models import DataSource, RawData
-from config.settings import Settings
+from config.settings import get_settings
+from script_helpers import get_extractor
 
 # Configure logging
 logging.basicConfig(
@@ -22,13 +25,31 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def get_test_data_source_id() -> int:
+    """Return the id of the shared test DataSource, creating the row on first use only."""
+    with db_manager.get_session() as session:
+        test_source = session.query(DataSource).filter_by(name="openai_test_source").first()
+        if test_source is None:
+            test_source = DataSource(
+                name="openai_test_source",
+                source_type="api",
+                url="https://test.com",
+                api_key_required=False,
+                rate_limit=100,
+                status="active"
+            )
+            session.add(test_source)
+            session.flush()
+        return test_source.id
+
+
 def test_openai_connection():
     """Test OpenAI API connection."""
     print("🔑 Testing OpenAI API Connection...")
     
     try:
-        settings = Settings()
-        api_key = settings.OPENAI_API_KEY
+        api_key = get_settings().OPENAI_API_KEY
         
         if not api_key:
             print("❌ OPENAI_API_KEY not found in environment")
@@ -55,7 +76,7 @@ def test_ai_client_initialization():
     print("\n🤖 Testing AI Client Initialization...")
     
     try:
-        hybrid_extractor = HybridIdeaExtractor()
+        hybrid_extractor = get_extractor()
         
         if hybrid_extractor.ai_client:
             print("✅ AI client initialized successfully")
@@ -76,20 +97,8 @@ def test_ai_synthesis_with_sample_data():
     
     try:
         # Create sample data for testing
+        test_source_id = get_test_data_source_id()
         with db_manager.get_session() as session:
-            # Create test data source
-            test_source = DataSource(
-                name="openai_test_source",
-                source_type="api",
-                url="https://test.com",
-                api_key_required=False,
-                rate_limit=100,
-                status="active"
-            )
-            session.add(test_source)
-            session.commit()
-            session.refresh(test_source)
-            
             # Create sample research papers for synthesis
             test_papers = [
                 {
@@ -109,36 +118,64 @@ def test_ai_synthesis_with_sample_data():
                 }
             ]
             
-            raw_data_items = []
-            for paper in test_papers:
-                raw_data = RawData(
-                    data_source_id=test_source.id,
-                    content_type="paper",
-                    title=paper["title"],
-                    authors=["Test Author"],
-                    abstract=paper["abstract"],
-                    url="https://test.com/paper",
-                    publication_date=datetime.now(),
-                    keywords=["mental health", "intervention", "wellbeing"],
-                    metadata_json={"domain": paper["domain"]}
-                )
-                session.add(raw_data)
-                raw_data_items.append(raw_data)
+            rows = [
+                {
+                    "data_source_id": test_source_id,
+                    "content_type": "paper",
+                    "title": paper["title"],
+                    "authors": ["Test Author"],
+                    "abstract": paper["abstract"],
+                    "url": "https://test.com/paper",
+                    "publication_date": datetime.now(),
+                    "keywords": ["mental health", "intervention", "wellbeing"],
+                    "metadata_json": {"domain": paper["domain"]}
+                }
+                for paper in test_papers
+            ]
             
+            # One executemany INSERT ... RETURNING instead of per-object unit-of-work flushes
+            raw_data_ids = session.scalars(insert(RawData).returning(RawData.id), rows).all()
             session.commit()
-            
-            # Get the raw data IDs
-            raw_data_ids = [item.id for item in raw_data_items]
         
         # Test AI synthesis
-        hybrid_extractor = HybridIdeaExtractor()
+        hybrid_extractor = get_extractor()
         
         if not hybrid_extractor.ai_client:
             print("❌ AI client not available - cannot test synthesis")
             return False
         
         print("📊 Running AI synthesis on sample data...")
-        ideas = hybrid_extractor.extract_ideas_from_raw_data()
+        
+        # Record the ingestion requests the pipeline builds and the batched calls it makes:
+        # same-domain papers should share one request per OPENAI_INGESTION_BATCH_SIZE texts
+        ingestion_requests = []
+        batch_calls = []
+        ingest_items = hybrid_extractor._ingest_items_async
+        ingest_batch = hybrid_extractor._call_ai_for_batch_ingestion_async
+        
+        async def recording_ingest_items(requests):
+            ingestion_requests.extend(requests)
+            return await ingest_items(requests)
+        
+        async def counting_ingest_batch(client, texts, domain, *args):
+            batch_calls.append((domain, len(texts)))
+            return await ingest_batch(client, texts, domain, *args)
+        
+        hybrid_extractor._ingest_items_async = recording_ingest_items
+        hybrid_extractor._call_ai_for_batch_ingestion_async = counting_ingest_batch
+        try:
+            ideas = hybrid_extractor.extract_ideas_from_raw_data()
+        finally:
+            del hybrid_extractor._ingest_items_async
+            del hybrid_extractor._call_ai_for_batch_ingestion_async
+        
+        expected_calls = len(hybrid_extractor._batch_ingestion_requests(ingestion_requests))
+        domain_count = len({request[-1] for request in ingestion_requests})
+        print(f"📨 {len(batch_calls)} ingestion call(s) for {len(ingestion_requests)} papers "
+              f"across {domain_count} domain(s)")
+        batched = len(batch_calls) == expected_calls
+        if not batched:
+            print(f"❌ Expected {expected_calls} batched ingestion call(s)")
         
         # Filter for AI-synthesized ideas
         ai_ideas = [idea for idea in ideas if idea.get('extraction_method') == 'ai_synthesis']
@@ -154,19 +191,16 @@ def test_ai_synthesis_with_sample_data():
                 print(f"     Expected Impact: {idea.get('expected_impact', 'N/A')[:100]}...")
                 print(f"     Confidence: {idea.get('confidence_score', 'N/A')}")
         
-        # Clean up test data
+        # Clean up the sample papers; the data source row is kept for the next run
         with db_manager.get_session() as session:
-            for raw_data_id in raw_data_ids:
-                session.query(RawData).filter(RawData.id == raw_data_id).delete()
-            session.query(DataSource).filter(DataSource.id == test_source.id).delete()
+            session.query(RawData).filter(RawData.id.in_(raw_data_ids)).delete(synchronize_session=False)
             session.commit()
         
-        return len(ai_ideas) > 0
+        return batched and len(ai_ideas) > 0
         
     except Exception as e:
         print(f"❌ Error testing AI synthesis: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("AI synthesis test failed")
         return False
 
 
@@ -175,7 +209,7 @@ def test_ai_synthesis_prompt():
     print("\n📝 Testing AI Synthesis Prompt...")
     
     try:
-        hybrid_extractor = HybridIdeaExtractor()
+        hybrid_extractor = get_extractor()
         
         if not hybrid_extractor.ai_client:
             print("❌ AI client not available")
@@ -191,7 +225,8 @@ Abstract: Evaluation of mobile-based mental health interventions in developing c
 """
         
         print("🧠 Testing AI synthesis with sample context...")
-        domain_ideas = hybrid_extractor._call_ai_for_synthesis(test_context, "wellbeing")
+        # Only the first idea is inspected, so stop the stream once it is complete
+        domain_ideas = hybrid_extractor._call_ai_for_synthesis(test_context, "wellbeing", max_ideas=1)
         
         print(f"Generated {len(domain_ideas)} ideas from test context")
         
@@ -207,8 +242,7 @@ Abstract: Evaluation of mobile-based mental health interventions in developing c
         
     except Exception as e:
         print(f"❌ Error testing AI synthesis prompt: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("AI synthesis prompt test failed")
         return False
 
 
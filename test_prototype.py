@@ -3,7 +3,9 @@
 Test script for the philanthropic ideas generator prototype.
 """
 import asyncio
+import importlib
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 # Set up logging
@@ -22,15 +24,16 @@ def test_database_connection():
             result = session.execute(text("SELECT 1")).fetchone()
             logger.info("✓ Database connection successful")
             
-            # Test table creation
-            sources = session.query(DataSource).count()
-            logger.info(f"✓ Data sources table accessible: {sources} sources")
-            
-            raw_data = session.query(RawData).count()
-            logger.info(f"✓ Raw data table accessible: {raw_data} items")
-            
-            ideas = session.query(ExtractedIdea).count()
-            logger.info(f"✓ Extracted ideas table accessible: {ideas} ideas")
+            # Test table creation: count all three tables in one statement
+            from sqlalchemy import func, select
+            counts = session.execute(select(
+                select(func.count()).select_from(DataSource).scalar_subquery().label("sources"),
+                select(func.count()).select_from(RawData).scalar_subquery().label("raw_data"),
+                select(func.count()).select_from(ExtractedIdea).scalar_subquery().label("ideas")
+            )).one()
+            logger.info(f"✓ Data sources table accessible: {counts.sources} sources")
+            logger.info(f"✓ Raw data table accessible: {counts.raw_data} items")
+            logger.info(f"✓ Extracted ideas table accessible: {counts.ideas} ideas")
             
             return True
             
@@ -53,28 +56,30 @@ def test_configuration():
         logger.error(f"✗ Configuration test failed: {e}")
         return False
 
+# (log label, module, class) for each component test_components initializes
+COMPONENTS = [
+    ("Data ingestion orchestrator", "data_ingestion.main", "DataIngestionOrchestrator"),
+    ("Idea extractor", "analysis.idea_extractor", "IdeaExtractor"),
+    ("Idea evaluator", "scoring.idea_evaluator", "IdeaEvaluator"),
+    ("Talent identifier", "scoring.talent_identifier", "TalentIdentifier"),
+]
+
+def init_component(module_name: str, class_name: str):
+    """Import a component's module and construct it."""
+    return getattr(importlib.import_module(module_name), class_name)()
+
 def test_components():
     """Test component initialization."""
     try:
-        # Test data ingestion orchestrator
-        from data_ingestion.main import DataIngestionOrchestrator
-        orchestrator = DataIngestionOrchestrator()
-        logger.info("✓ Data ingestion orchestrator initialized")
-        
-        # Test idea extractor
-        from analysis.idea_extractor import IdeaExtractor
-        extractor = IdeaExtractor()
-        logger.info("✓ Idea extractor initialized")
-        
-        # Test idea evaluator
-        from scoring.idea_evaluator import IdeaEvaluator
-        evaluator = IdeaEvaluator()
-        logger.info("✓ Idea evaluator initialized")
-        
-        # Test talent identifier
-        from scoring.talent_identifier import TalentIdentifier
-        identifier = TalentIdentifier()
-        logger.info("✓ Talent identifier initialized")
+        # Each component loads its own models and data, so import and build them side by side
+        with ThreadPoolExecutor(max_workers=len(COMPONENTS)) as executor:
+            futures = {
+                executor.submit(init_component, module_name, class_name): label
+                for label, module_name, class_name in COMPONENTS
+            }
+            for future in as_completed(futures):
+                future.result()
+                logger.info(f"✓ {futures[future]} initialized")
         
         return True
         
@@ -82,32 +87,39 @@ def test_components():
         logger.error(f"✗ Component test failed: {e}")
         return False
 
+async def fetch_json(session, url: str):
+    """GET a URL and return its status with the JSON body (None unless 200)."""
+    async with session.get(url) as response:
+        return response.status, (await response.json() if response.status == 200 else None)
+
 async def test_api_endpoints():
     """Test API endpoints."""
     try:
         import aiohttp
-        import json
         
         base_url = "http://localhost:8000"
         
-        async with aiohttp.ClientSession() as session:
+        connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=30)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            # The endpoint checks are independent, so overlap their round-trips
+            (health_status, _), (status_code, data) = await asyncio.gather(
+                fetch_json(session, f"{base_url}/health"),
+                fetch_json(session, f"{base_url}/prototype/status")
+            )
+            
             # Test health endpoint
-            async with session.get(f"{base_url}/health") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info("✓ Health endpoint working")
-                else:
-                    logger.warning("⚠ Health endpoint returned non-200 status")
+            if health_status == 200:
+                logger.info("✓ Health endpoint working")
+            else:
+                logger.warning("⚠ Health endpoint returned non-200 status")
             
             # Test prototype status endpoint
-            async with session.get(f"{base_url}/prototype/status") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info("✓ Prototype status endpoint working")
-                    logger.info(f"  - Raw data: {data.get('total_raw_data', 0)} items")
-                    logger.info(f"  - Ideas: {data.get('total_ideas', 0)} extracted")
-                else:
-                    logger.warning("⚠ Prototype status endpoint returned non-200 status")
+            if status_code == 200:
+                logger.info("✓ Prototype status endpoint working")
+                logger.info(f"  - Raw data: {data.get('total_raw_data', 0)} items")
+                logger.info(f"  - Ideas: {data.get('total_ideas', 0)} extracted")
+            else:
+                logger.warning("⚠ Prototype status endpoint returned non-200 status")
             
             return True
             
@@ -118,6 +130,14 @@ async def test_api_endpoints():
         logger.error(f"✗ API test failed: {e}")
         return False
 
+async def run_tests(tests):
+    """Run the sync tests on worker threads, overlapped with the API endpoint check."""
+    return await asyncio.gather(
+        *[asyncio.to_thread(test_func) for _, test_func in tests],
+        test_api_endpoints(),
+        return_exceptions=True
+    )
+
 def main():
     """Run all tests."""
     logger.info("=" * 60)
@@ -130,32 +150,30 @@ def main():
         ("Components", test_components),
     ]
     
+    # The checks are independent (and mostly I/O), so wall time is the slowest one
+    *results, api_result = asyncio.run(run_tests(tests))
+    
     passed = 0
     total = len(tests)
     
-    for test_name, test_func in tests:
-        logger.info(f"\n--- Testing {test_name} ---")
-        try:
-            if test_func():
-                passed += 1
-                logger.info(f"✓ {test_name} test PASSED")
-            else:
-                logger.error(f"✗ {test_name} test FAILED")
-        except Exception as e:
-            logger.error(f"✗ {test_name} test ERROR: {e}")
-    
-    # Test API endpoints if server is running
-    logger.info(f"\n--- Testing API Endpoints ---")
-    try:
-        result = asyncio.run(test_api_endpoints())
-        if result:
+    for (test_name, _), result in zip(tests, results):
+        if isinstance(result, Exception):
+            logger.error(f"✗ {test_name} test ERROR: {result}")
+        elif result:
             passed += 1
-            total += 1
-            logger.info("✓ API endpoints test PASSED")
+            logger.info(f"✓ {test_name} test PASSED")
         else:
-            logger.warning("⚠ API endpoints test FAILED (server may not be running)")
-    except Exception as e:
-        logger.warning(f"⚠ API endpoints test SKIPPED (server may not be running): {e}")
+            logger.error(f"✗ {test_name} test FAILED")
+    
+    # API endpoints only count if the server is running
+    if isinstance(api_result, Exception):
+        logger.warning(f"⚠ API endpoints test SKIPPED (server may not be running): {api_result}")
+    elif api_result:
+        passed += 1
+        total += 1
+        logger.info("✓ API endpoints test PASSED")
+    else:
+        logger.warning("⚠ API endpoints test FAILED (server may not be running)")
     
     logger.info("\n" + "=" * 60)
     logger.info(f"TEST SUMMARY: {passed}/{total} tests passed")